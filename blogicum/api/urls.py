@@ -0,0 +1,20 @@
+from django.urls import path
+from . import views
+
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.index, name='index'),
+    path('posts/export/', views.export_posts, name='export_posts'),
+    path('posts/<int:post_pk>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_pk>/comments/',
+         views.post_comments,
+         name='post_comments'),
+    path('category/<slug:category_slug>/',
+         views.category_posts,
+         name='category_posts'),
+    path('profile/<slug:username>/',
+         views.profile_posts,
+         name='profile'),
+]
@@ -0,0 +1,201 @@
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, set_response_etag
+
+from blog.models import Category, Comment, Post
+from blog.page_cache import cache_anonymous_page
+from blog.utils import (
+    COMMENTS_PAGINATION_LIMIT,
+    CURSOR_PARAM,
+    PAGINATION_LIMIT,
+    KeysetPaginator,
+)
+
+
+User = get_user_model()
+
+EXPORT_CHUNK_SIZE = 2000
+
+POST_FIELDS = ('id', 'title', 'text', 'pub_date', 'comment_count', 'image')
+POST_RELATED_FIELDS = {
+    'author_username': F('author__username'),
+    'category_slug': F('category__slug'),
+    'category_title': F('category__title'),
+    'location_name': F('location__name'),
+    'location_is_published': F('location__is_published'),
+}
+COMMENT_FIELDS = ('id', 'text', 'created_at')
+COMMENT_RELATED_FIELDS = {
+    'author_username': F('author__username'),
+}
+
+
+def post_rows(queryset):
+    return queryset.values(*POST_FIELDS, **POST_RELATED_FIELDS)
+
+
+def serialize_post(row):
+    category = None
+    if row['category_slug'] is not None:
+        category = {
+            'slug': row['category_slug'],
+            'title': row['category_title'],
+        }
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'text': row['text'],
+        'pub_date': row['pub_date'],
+        'author': row['author_username'],
+        'category': category,
+        'location': (row['location_name']
+                     if row['location_is_published'] else None),
+        'image': default_storage.url(row['image']) if row['image'] else None,
+        'comment_count': row['comment_count'],
+    }
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'author': row['author_username'],
+        'text': row['text'],
+        'created_at': row['created_at'],
+    }
+
+
+def is_visible(request, row):
+    """Те же правила доступа, что и у blog.views.post_detail."""
+    return (
+        row['is_published'] and row['pub_date'] <= timezone.now()
+        or request.user.is_authenticated
+        and request.user.pk == row['author_id']
+    )
+
+
+def get_visible_row(request, post_pk, *fields, **expressions):
+    row = Post.objects.filter(pk=post_pk).values(
+        'is_published', 'pub_date', 'author_id', *fields, **expressions
+    ).first()
+    if row is None or not is_visible(request, row):
+        raise Http404
+    return row
+
+
+def page_response(request, paginator, serialize):
+    page = paginator.get_page(request.GET.get(CURSOR_PARAM))
+    return JsonResponse({
+        'results': [serialize(row) for row in page.object_list],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
+
+
+def with_etag(view):
+    """Добавляет ETag по телу ответа и отвечает 304 на If-None-Match.
+
+    Стоит снаружи кэша страниц, чтобы и ответ из кэша мог стать 304.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming:
+            return response
+        if not response.has_header('ETag'):
+            set_response_etag(response)
+        return get_conditional_response(
+            request, etag=response['ETag'], response=response
+        )
+    return wrapper
+
+
+@with_etag
+@cache_anonymous_page
+def index(request):
+    queryset = post_rows(Post.objects.custom_filter(timezone.now()))
+    return page_response(
+        request, KeysetPaginator(queryset, PAGINATION_LIMIT), serialize_post
+    )
+
+
+@with_etag
+@cache_anonymous_page
+def category_posts(request, category_slug):
+    category = get_object_or_404(
+        Category.objects.only('pk'), slug=category_slug, is_published=True
+    )
+    queryset = post_rows(
+        Post.objects.custom_filter(timezone.now()).filter(category=category)
+    )
+    return page_response(
+        request, KeysetPaginator(queryset, PAGINATION_LIMIT), serialize_post
+    )
+
+
+@with_etag
+@cache_anonymous_page
+def profile_posts(request, username):
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    if request.user.pk == author.pk:
+        queryset = Post.objects.filter(author=author)
+    else:
+        queryset = Post.objects.custom_filter(timezone.now()).filter(
+            author=author)
+    return page_response(
+        request, KeysetPaginator(post_rows(queryset), PAGINATION_LIMIT),
+        serialize_post
+    )
+
+
+@with_etag
+@cache_anonymous_page
+def post_detail(request, post_pk):
+    row = get_visible_row(request, post_pk, *POST_FIELDS,
+                          **POST_RELATED_FIELDS)
+    return JsonResponse(serialize_post(row))
+
+
+@with_etag
+@cache_anonymous_page
+def post_comments(request, post_pk):
+    get_visible_row(request, post_pk)
+    queryset = Comment.objects.filter(post_id=post_pk).values(
+        *COMMENT_FIELDS, **COMMENT_RELATED_FIELDS
+    )
+    paginator = KeysetPaginator(
+        queryset, COMMENTS_PAGINATION_LIMIT,
+        date_field='created_at', descending=False,
+    )
+    return page_response(request, paginator, serialize_comment)
+
+
+def stream_json_list(rows, serialize):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    yield '['
+    separator = ''
+    for row in rows:
+        yield separator + encoder.encode(serialize(row))
+        separator = ','
+    yield ']'
+
+
+def export_posts(request):
+    """Все опубликованные записи одним JSON-массивом.
+
+    Строки читаются из базы порциями и сразу отдаются клиенту,
+    поэтому память не растёт вместе с размером ленты.
+    """
+    rows = post_rows(
+        Post.objects.custom_filter(timezone.now()).order_by('-pub_date', '-id')
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    return StreamingHttpResponse(
+        stream_json_list(rows, serialize_post),
+        content_type='application/json; charset=utf-8',
+    )
@@ -1,18 +1,178 @@
-from django.contrib import admin
-from django.db import models
-from django.forms import Textarea
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import EmptyPage, Paginator
+from django.db import models, transaction
+from django.forms import BaseModelFormSet, Textarea
+from django.urls import reverse
+from django.utils.formats import date_format
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.utils import timezone
+from django.utils.http import urlencode
 from .models import Post, Category, Location
+from .page_cache import invalidate_pages
+from .publication import schedule_publication
+from .utils import (
+    EstimatedCount,
+    feed_count_key,
+    invalidate_feed_counts,
+    post_feed_count_keys,
+)
 
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class PostInline(admin.TabularInline):
-    formfield_overrides = {
-        models.TextField: {'widget': Textarea(attrs={'rows': 10, 'cols': 40})},
-    }
-    model = Post
-    extra = 0
+def feed_pairs(queryset):
+    """Пары (категория, автор) публикаций queryset — по ним сбрасываются
+    счётчики лент.
+    """
+    return set(queryset.order_by().values_list(
+        'category_id', 'author_id').distinct())
+
+
+def bulk_update(queryset, **values):
+    """Одним UPDATE меняет строки queryset, которые ещё отличаются.
+
+    Сигналы save() не вызываются, поэтому updated_at для ETag
+    выставляется здесь. Возвращает (изменено, выбрано).
+    """
+    selected = queryset.count()
+    changed = queryset.exclude(**values).update(
+        updated_at=timezone.now(), **values)
+    return changed, selected
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение с подписью выбранного значения без запроса.
+
+    Если формсет передал selected_labels, подпись берётся из них,
+    иначе виджет, как обычно, загружает выбранный объект.
+    """
+
+    selected_labels = None
+
+    def optgroups(self, name, value, attr=None):
+        if self.selected_labels is None:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        for option_value in value:
+            label = self.selected_labels.get(str(option_value))
+            if label is not None:
+                options.append(self.create_option(
+                    name, option_value, label, True, len(options)))
+        return [(None, options, 0)]
+
+
+class PreloadedChoicesFormSet(BaseModelFormSet):
+    """Формсет list_editable, отдающий виджетам уже загруженные объекты.
+
+    Строки списка приходят с list_select_related, поэтому подпись
+    выбранного автора или местоположения известна без запроса на
+    каждую строку.
+    """
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        for name, field in form.fields.items():
+            widget = getattr(field.widget, 'widget', field.widget)
+            if not isinstance(widget, PreloadedAutocompleteSelect):
+                continue
+            model_field = form.instance._meta.get_field(name)
+            if not model_field.is_cached(form.instance):
+                continue
+            related = getattr(form.instance, name)
+            widget.selected_labels = {} if related is None else {
+                str(related.pk): field.label_from_instance(related),
+            }
+        return form
+
+
+def report_bulk_action(model_admin, request, done, changed, selected):
+    model_admin.message_user(
+        request,
+        f'{done}: {changed} из {selected}, остальные уже были такими.',
+        messages.SUCCESS,
+    )
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(), required=False, label='Категория')
+    location = forms.ModelChoiceField(
+        Location.objects.all(), required=False, label='Местоположение',
+        widget=AutocompleteSelect(
+            Post._meta.get_field('location'), admin.site),
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор списка в админке без точного COUNT(*) всей таблицы.
+
+    Оценка может отставать от таблицы, поэтому страницы за последней
+    по оценке открываются, пока в них есть строки.
+    """
+
+    @cached_property
+    def count(self):
+        return EstimatedCount(self.object_list)()
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            number = int(number)
+            bottom = (number - 1) * self.per_page
+            if number > 1 and self.object_list[bottom:bottom + 1]:
+                return number
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class RecentPostsMixin:
+    """Последние публикации объекта вместо встроенного списка всех.
+
+    Страница объекта показывает RECENT_POSTS_LIMIT ссылок на
+    публикации и ссылку на список публикаций, отфильтрованный
+    по posts_filter, где доступны поиск и постраничный вывод.
+    """
+
+    RECENT_POSTS_LIMIT = 10
+    posts_filter = None
+    readonly_fields = ('recent_posts',)
+
+    @admin.display(description='Последние публикации')
+    def recent_posts(self, obj):
+        if obj.pk is None:
+            return self.get_empty_value_display()
+        posts = Post.objects.filter(**{self.posts_filter: obj}).only(
+            'pk', 'title', 'pub_date')[:self.RECENT_POSTS_LIMIT]
+        changelist_url = '{}?{}'.format(
+            reverse('admin:blog_post_changelist'),
+            urlencode({f'{self.posts_filter}__id__exact': obj.pk}),
+        )
+        return format_html(
+            '<ul>{}</ul><a href="{}">Все публикации</a>',
+            format_html_join(
+                '', '<li><a href="{}">{}</a> ({})</li>',
+                (
+                    (reverse('admin:blog_post_change', args=(post.pk,)),
+                     post.title, date_format(post.pub_date))
+                    for post in posts
+                ),
+            ),
+            changelist_url,
+        )
 
 
 @admin.register(Post)
@@ -39,13 +199,102 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('category',)
     list_display_links = ('title', )
+    list_select_related = ('author', 'location', 'category')
+    autocomplete_fields = ('author', 'location')
+    # Небольшой справочник: варианты выбираются одним запросом на
+    # страницу и общие для всех строк list_editable.
+    shared_choice_fields = ('category',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = PostActionForm
+    actions = (
+        'publish',
+        'unpublish',
+        'move_to_category',
+        'set_location',
+    )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs.setdefault('widget', PreloadedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get('using')))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_dbfield(db_field, request, **kwargs)
+        if formfield is not None and (
+                db_field.name in self.shared_choice_fields):
+            formfield.choices = list(formfield.choices)
+        return formfield
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formset', PreloadedChoicesFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
+    def bulk_action(self, request, queryset, done, **values):
+        with transaction.atomic():
+            pairs = feed_pairs(queryset)
+            changed, selected = bulk_update(queryset, **values)
+        new_category = values.get('category')
+        keys = set()
+        for category_id, author_id in pairs:
+            keys.update(post_feed_count_keys(category_id, author_id))
+            if new_category is not None:
+                keys.update(post_feed_count_keys(new_category.pk, author_id))
+        invalidate_feed_counts(*keys)
+        invalidate_pages()
+        report_bulk_action(self, request, done, changed, selected)
+
+    def get_action_value(self, request, name):
+        # Поле action проверяет сам список изменений, здесь нужно
+        # только значение для действия.
+        form = self.action_form(request.POST)
+        form.is_valid()
+        value = form.cleaned_data.get(name)
+        if value is None:
+            label = form.fields[name].label.lower()
+            self.message_user(
+                request, f'Выберите значение в поле «{label}».',
+                messages.ERROR)
+        return value
+
+    @admin.action(description='Опубликовать выбранные публикации')
+    def publish(self, request, queryset):
+        self.bulk_action(request, queryset, 'Опубликовано',
+                         is_published=True)
+        # UPDATE обходит сигналы, поэтому события для отложенных
+        # публикаций ставятся здесь.
+        if not settings.BLOG_PUBLICATION_EVENTS:
+            return
+        future = queryset.filter(pub_date__gt=timezone.now())
+        for post in future.select_related(None).only(
+                'pk', 'pub_date', 'is_published'):
+            schedule_publication(post)
+
+    @admin.action(description='Снять с публикации выбранные публикации')
+    def unpublish(self, request, queryset):
+        self.bulk_action(request, queryset, 'Снято с публикации',
+                         is_published=False)
+
+    @admin.action(description='Перенести в выбранную категорию')
+    def move_to_category(self, request, queryset):
+        category = self.get_action_value(request, 'category')
+        if category is not None:
+            self.bulk_action(request, queryset, 'Перенесено',
+                             category=category)
+
+    @admin.action(description='Указать выбранное местоположение')
+    def set_location(self, request, queryset):
+        location = self.get_action_value(request, 'location')
+        if location is not None:
+            self.bulk_action(request, queryset, 'Изменено местоположение',
+                             location=location)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class CategoryAdmin(RecentPostsMixin, admin.ModelAdmin):
+    posts_filter = 'category'
+    actions = ('publish', 'unpublish')
     list_display = (
         'title',
         'description',
@@ -64,17 +313,42 @@ class CategoryAdmin(admin.ModelAdmin):
         'title',
     )
 
+    def bulk_action(self, request, queryset, done, **values):
+        with transaction.atomic():
+            author_ids = set(Post.objects.filter(
+                category__in=queryset).order_by().values_list(
+                'author_id', flat=True).distinct())
+            category_ids = list(queryset.values_list('pk', flat=True))
+            changed, selected = bulk_update(queryset, **values)
+        invalidate_feed_counts(
+            feed_count_key('index'),
+            *(feed_count_key('category', pk) for pk in category_ids),
+            *(feed_count_key('author', author_id, 'published')
+              for author_id in author_ids),
+        )
+        invalidate_pages()
+        report_bulk_action(self, request, done, changed, selected)
+
+    @admin.action(description='Опубликовать выбранные категории')
+    def publish(self, request, queryset):
+        self.bulk_action(request, queryset, 'Опубликовано',
+                         is_published=True)
+
+    @admin.action(description='Снять с публикации выбранные категории')
+    def unpublish(self, request, queryset):
+        self.bulk_action(request, queryset, 'Снято с публикации',
+                         is_published=False)
+
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class LocationAdmin(RecentPostsMixin, admin.ModelAdmin):
+    posts_filter = 'location'
     list_display = (
         'name',
         'is_published',
         'created_at',
     )
+    search_fields = ('name',)
     list_editable = (
         'is_published',
     )
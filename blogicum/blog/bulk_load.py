@@ -0,0 +1,168 @@
+"""Быстрая загрузка фикстур JSON пачками.
+
+В отличие от loaddata, объекты не сохраняются по одному через save():
+файл разбирается потоково, объекты одной модели копятся в пачку
+и вставляются одним INSERT, поэтому сигналы (кэш, поиск, миниатюры)
+не срабатывают. Производные данные пересчитываются один раз после
+загрузки командой fast_loaddata.
+"""
+import json
+from collections import Counter
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 1000
+SEPARATORS = ' \t\r\n,'
+
+decoder = json.JSONDecoder()
+
+
+def read_more(file, buffer, position, chunk_size):
+    chunk = file.read(chunk_size)
+    if not chunk:
+        raise ValueError('Фикстура оборвалась до конца массива.')
+    return buffer[position:] + chunk, 0
+
+
+def iter_json_array(file, chunk_size=CHUNK_SIZE):
+    """Элементы массива JSON верхнего уровня по одному.
+
+    В памяти держится только недочитанный хвост файла, а не весь
+    массив, как у json.load.
+    """
+    buffer = file.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Фикстура должна быть массивом JSON.')
+    position = 1
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+        if position == len(buffer):
+            buffer, position = read_more(file, buffer, position, chunk_size)
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Объект не дочитан: берём следующий кусок файла. Настоящая
+            # ошибка синтаксиса всплывёт, когда файл закончится.
+            buffer, position = read_more(file, buffer, position, chunk_size)
+            continue
+        yield item
+
+
+def iter_batches(objects, batch_size):
+    """Пачки подряд идущих объектов одной модели."""
+    batch, model = [], None
+    for obj in objects:
+        if batch and (obj.object._meta.model is not model
+                      or len(batch) >= batch_size):
+            yield model, batch
+            batch = []
+        batch.append(obj)
+        model = obj.object._meta.model
+    if batch:
+        yield model, batch
+
+
+def fill_timestamps(model, instances):
+    """Заполняет auto_now и auto_now_add, которых нет в фикстуре.
+
+    Фикстуры, снятые до появления поля (как updated_at в db.json),
+    иначе не вставились бы из-за NOT NULL.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    for obj in instances:
+        for field in fields:
+            if getattr(obj, field.attname) is None:
+                field.pre_save(obj, add=True)
+
+
+def insert_raw(model, instances, using):
+    """INSERT со значениями как есть: без auto_now и прочих pre_save."""
+    connection = connections[using]
+    fields = model._meta.concrete_fields
+    size = max(connection.ops.bulk_batch_size(fields, instances), 1)
+    queryset = model._base_manager.using(using)
+    for start in range(0, len(instances), size):
+        queryset._insert(
+            instances[start:start + size], fields=fields, using=using,
+            raw=True,
+        )
+
+
+def save_batch(model, batch, using):
+    """Вставляет новые объекты пачки и обновляет уже существующие.
+
+    Как и loaddata, объект с занятым первичным ключом перезаписывает
+    строку в базе.
+    """
+    manager = model._base_manager.db_manager(using)
+    instances = [item.object for item in batch]
+    fill_timestamps(model, instances)
+    with_pk = [obj for obj in instances if obj.pk is not None]
+    existing = set(manager.filter(
+        pk__in=[obj.pk for obj in with_pk]).values_list('pk', flat=True))
+    insert_raw(model, [obj for obj in with_pk if obj.pk not in existing],
+               using)
+    manager.bulk_create([obj for obj in instances if obj.pk is None])
+    updated = [obj for obj in with_pk if obj.pk in existing]
+    if updated:
+        manager.bulk_update(updated, [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+        ])
+    save_m2m(model, batch, using)
+
+
+def save_m2m(model, batch, using):
+    for name in {name for item in batch for name in item.m2m_data}:
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source = f'{field.m2m_field_name()}_id'
+        target = f'{field.m2m_reverse_field_name()}_id'
+        items = [item for item in batch if name in item.m2m_data]
+        through._base_manager.using(using).filter(**{
+            f'{source}__in': [item.object.pk for item in items],
+        }).delete()
+        through._base_manager.using(using).bulk_create(
+            through(**{source: item.object.pk, target: related_pk})
+            for item in items for related_pk in item.m2m_data[name]
+        )
+
+
+def load_fixture(file, batch_size=BATCH_SIZE, using=DEFAULT_DB_ALIAS):
+    """Загружает фикстуру JSON, возвращает Counter объектов по моделям.
+
+    Внешние ключи проверяются один раз в конце, поэтому порядок
+    моделей в файле не важен, как и у loaddata.
+    """
+    connection = connections[using]
+    objects = serializers.deserialize(
+        'python', iter_json_array(file), using=using,
+        ignorenonexistent=True,
+    )
+    counts = Counter()
+    with transaction.atomic(using=using):
+        with connection.constraint_checks_disabled():
+            for model, batch in iter_batches(objects, batch_size):
+                save_batch(model, batch, using)
+                counts[model] += len(batch)
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in counts])
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), list(counts))
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+    return counts
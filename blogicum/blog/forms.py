@@ -1,5 +1,9 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.contrib.auth.forms import PasswordResetForm
+from django.template import loader
+from jobs.queue import enqueue
+from jobs.tasks import send_email
 from .models import Post, Comment
 
 User = get_user_model()
@@ -28,3 +32,22 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        html_body = None
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(
+                html_email_template_name, context)
+        enqueue(
+            send_email,
+            subject=''.join(subject.splitlines()),
+            body=loader.render_to_string(email_template_name, context),
+            from_email=from_email,
+            to=[to_email],
+            html_body=html_body,
+        )
@@ -0,0 +1,145 @@
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.utils import PAGINATION_LIMIT
+
+
+User = get_user_model()
+
+# Значения SQLite по умолчанию для сравнения с SQLITE_PRAGMAS.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'mmap_size': 0,
+    'cache_size': -2000,
+}
+
+
+class Command(BaseCommand):
+    help = ('Нагружает базу N потоками-читателями ленты и M потоками, '
+            'добавляющими комментарии, и печатает пропускную способность, '
+            'задержки и ошибки. Созданные комментарии удаляются. '
+            'Запускайте на отдельной базе с публикациями (bench_feed '
+            '--seed).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Длительность замера в секундах.',
+        )
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Сначала замерить с настройками SQLite по умолчанию, '
+                 'затем с SQLITE_PRAGMAS.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер рассчитан на SQLite.')
+        post_ids = list(Post.objects.custom_filter(timezone.now()).order_by(
+            '-pub_date').values_list('pk', flat=True)[:100])
+        author = User.objects.order_by('pk').first()
+        if not post_ids or author is None:
+            raise CommandError(
+                'Нужны опубликованные записи, запустите bench_feed --seed N.')
+        variants = [('SQLITE_PRAGMAS', None)]
+        if options['compare']:
+            variants.insert(0, ('по умолчанию', DEFAULT_PRAGMAS))
+        for title, pragmas in variants:
+            connections.close_all()
+            if pragmas is None:
+                result = self.run(post_ids, author, options)
+            else:
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    result = self.run(post_ids, author, options)
+            self.report(title, result, options['duration'])
+        connections.close_all()
+
+    def run(self, post_ids, author, options):
+        deadline = time.perf_counter() + options['duration']
+        timings = {'reader': [], 'writer': []}
+        errors = Counter()
+        created = []
+        lock = threading.Lock()
+
+        def read():
+            date_now = timezone.now()
+            list(Post.objects.custom_filter(date_now).order_by(
+                '-pub_date')[:PAGINATION_LIMIT])
+
+        def write():
+            post_id = random.choice(post_ids)
+            with transaction.atomic():
+                comment = Comment.objects.create(
+                    post_id=post_id, author=author, text='Замер нагрузки')
+                Post.objects.shift_comment_count(post_id, 1)
+            with lock:
+                created.append((comment.pk, post_id))
+
+        def worker(role, action):
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        action()
+                    except OperationalError as error:
+                        with lock:
+                            errors[(role, str(error))] += 1
+                        continue
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        timings[role].append(elapsed)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=('reader', read))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('writer', write))
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.cleanup(created)
+        return timings, errors
+
+    def cleanup(self, created):
+        shifts = Counter(post_id for _, post_id in created)
+        with transaction.atomic():
+            Comment.objects.filter(
+                pk__in=[pk for pk, _ in created]).delete()
+            for post_id, count in shifts.items():
+                Post.objects.shift_comment_count(post_id, -count)
+
+    def report(self, title, result, duration):
+        timings, errors = result
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for role, values in timings.items():
+            if not values:
+                self.stdout.write(f'  {role}: нет успешных операций')
+                continue
+            values.sort()
+            p99 = values[max(int(len(values) * 0.99) - 1, 0)]
+            self.stdout.write(
+                f'  {role}: {len(values) / duration:.0f} оп/с, '
+                f'медиана {statistics.median(values) * 1000:.2f} ms, '
+                f'p99 {p99 * 1000:.2f} ms'
+            )
+        for (role, message), count in errors.items():
+            self.stdout.write(self.style.ERROR(
+                f'  {role}: {message} — {count}'))
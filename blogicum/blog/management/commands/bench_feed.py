@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.synthetic import generate
+from blog.utils import PAGINATION_LIMIT
+
+
+class Command(BaseCommand):
+    help = ('Показывает EXPLAIN и время запросов ленты. С --seed заранее '
+            'заполняет базу синтетическими публикациями; запускайте '
+            'на отдельной базе, не на рабочей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Сколько публикаций создать перед замером (например, '
+                 '1000000).',
+        )
+        parser.add_argument(
+            '--comments', type=int, default=0,
+            help='Сколько комментариев создать вместе с публикациями.',
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз выполнять каждый запрос.',
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'], options['comments'],
+                      options['batch_size'])
+        post = Post.objects.order_by('-comment_count').first()
+        if post is None:
+            self.stderr.write('В базе нет публикаций, запустите с --seed.')
+            return
+        date_now = timezone.now()
+        deep_page = 100 * PAGINATION_LIMIT
+        cases = (
+            ('Лента, первая страница',
+             Post.objects.custom_filter(date_now).order_by('-pub_date')
+             [:PAGINATION_LIMIT]),
+            (f'Лента, OFFSET {deep_page}',
+             Post.objects.custom_filter(date_now).order_by('-pub_date')
+             [deep_page:deep_page + PAGINATION_LIMIT]),
+            ('Лента категории',
+             Post.objects.custom_filter(date_now).filter(
+                 category_id=post.category_id).order_by('-pub_date')
+             [:PAGINATION_LIMIT]),
+            ('Публикации автора',
+             Post.objects.filter(author_id=post.author_id)
+             .order_by('-pub_date')[:PAGINATION_LIMIT]),
+            ('Комментарии к публикации',
+             Comment.objects.filter(post_id=post.pk)
+             .order_by('created_at')[:PAGINATION_LIMIT]),
+        )
+        for title, queryset in cases:
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(queryset.explain())
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(queryset._chain())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'min {min(timings):.2f} ms, '
+                f'median {statistics.median(timings):.2f} ms\n'
+            )
+
+    def seed(self, posts, comments, batch_size):
+        generate(posts=posts, comments=comments, batch_size=batch_size,
+                 log=self.stdout.write)
+        if comments:
+            call_command('rebuild_comment_counts', stdout=self.stdout)
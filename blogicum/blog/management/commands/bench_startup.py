@@ -0,0 +1,133 @@
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+PROFILES = ('dev', 'test', 'prod')
+
+# Выполняется в отдельном интерпретаторе, чтобы замерить запуск с нуля.
+CHILD_SCRIPT = '''
+import json, statistics, sys, time
+started = time.perf_counter()
+import django
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+startup = time.perf_counter() - started
+from django.test import Client
+client = Client(HTTP_ACCEPT_ENCODING='gzip')
+paths, repeat = json.loads(sys.argv[1]), int(sys.argv[2])
+requests = {}
+for path in paths:
+    timings = []
+    for _ in range(repeat):
+        request_started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - request_started)
+    requests[path] = {
+        'status': response.status_code,
+        'bytes': len(response.content),
+        'first': timings[0],
+        'median': statistics.median(timings[1:] or timings),
+    }
+print(json.dumps({'startup': startup, 'requests': requests}))
+'''
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время запуска и задержку запросов в профилях '
+            'настроек BLOGICUM_ENV. Каждый профиль запускается в отдельном '
+            'процессе на текущей базе, поэтому она должна быть '
+            'мигрирована.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', action='append', choices=PROFILES,
+            help='Профиль для замера; по умолчанию все.',
+        )
+        parser.add_argument(
+            '--path', action='append',
+            help='Адрес страницы; по умолчанию / и /pages/about/.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Сколько раз запрашивать каждую страницу.',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Сколько свежих процессов запустить на профиль; по ним '
+                 'считается p99 первого (холодного) запроса.',
+        )
+        parser.add_argument(
+            '--compare-warmup', action='store_true',
+            help='Замерить каждый профиль с прогревом шаблонов и без него.',
+        )
+
+    def handle(self, *args, **options):
+        paths = options['path'] or ['/', '/pages/about/']
+        warmups = (True, False) if options['compare_warmup'] else (None,)
+        for profile in options['profile'] or PROFILES:
+            for warmup in warmups:
+                results = []
+                for _ in range(options['processes']):
+                    result = self.run_profile(
+                        profile, paths, options['repeat'], warmup)
+                    if result is None:
+                        break
+                    results.append(result)
+                else:
+                    self.report(profile, warmup, paths, results)
+
+    def report(self, profile, warmup, paths, results):
+        title = profile
+        if warmup is not None:
+            title += ' с прогревом' if warmup else ' без прогрева'
+        startup = [result['startup'] for result in results]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{title}: запуск, медиана '
+            f'{statistics.median(startup) * 1000:.0f} ms'))
+        for path in paths:
+            timings = [result['requests'][path] for result in results]
+            first = [timing['first'] for timing in timings]
+            self.stdout.write(
+                f'  {path} [{timings[-1]["status"]}, '
+                f'{timings[-1]["bytes"]} B] '
+                f'первый: медиана {statistics.median(first) * 1000:.1f} ms, '
+                f'p99 {percentile(first, 99) * 1000:.1f} ms; '
+                f'прогретый: медиана '
+                f'{statistics.median(t["median"] for t in timings) * 1000:.1f}'
+                ' ms'
+            )
+
+    def run_profile(self, profile, paths, repeat, warmup=None):
+        env = dict(
+            os.environ,
+            BLOGICUM_ENV=profile,
+            DJANGO_SETTINGS_MODULE=os.environ.get(
+                'DJANGO_SETTINGS_MODULE', 'blogicum.settings'),
+            DJANGO_ALLOWED_HOSTS='testserver',
+        )
+        if warmup is not None:
+            env['DJANGO_TEMPLATE_WARMUP'] = '1' if warmup else '0'
+        env.setdefault('DJANGO_SECRET_KEY', settings.SECRET_KEY)
+        completed = subprocess.run(
+            [sys.executable, '-c', CHILD_SCRIPT, json.dumps(paths),
+             str(repeat)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            self.stderr.write(
+                f'{profile}: процесс завершился с ошибкой\n'
+                f'{completed.stderr}')
+            return None
+        return json.loads(completed.stdout.splitlines()[-1])
@@ -0,0 +1,52 @@
+from django.core.management import call_command
+from django.core.serializers.base import DeserializationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.bulk_load import BATCH_SIZE, load_fixture
+from blog.models import Comment, Post
+from blog.page_cache import invalidate_pages
+
+
+class Command(BaseCommand):
+    help = ('Загружает фикстуру JSON (например, db.json) потоково и пачками '
+            'bulk_create, без сигналов save(). Затем один раз '
+            'пересчитывает счётчики комментариев и поисковый индекс '
+            'и сбрасывает кэш страниц.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к файлу JSON.')
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Сколько объектов вставлять одной пачкой.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--skip-rebuild', action='store_true',
+            help='Не пересчитывать счётчики комментариев и поисковый '
+                 'индекс.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['fixture'], encoding='utf-8') as file:
+                counts = load_fixture(
+                    file, options['batch_size'], options['database'])
+        except (OSError, ValueError, DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить фикстуру: {error}')
+        for model, count in counts.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        if not options['skip_rebuild']:
+            if Post in counts or Comment in counts:
+                call_command(
+                    'rebuild_comment_counts', database=options['database'],
+                    stdout=self.stdout,
+                )
+            if Post in counts:
+                call_command(
+                    'rebuild_search_index', database=options['database'],
+                    stdout=self.stdout,
+                )
+        invalidate_pages()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {sum(counts.values())}.'))
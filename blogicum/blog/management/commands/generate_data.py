@@ -0,0 +1,48 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog.page_cache import invalidate_pages
+from blog.synthetic import BATCH_SIZE, generate
+
+
+class Command(BaseCommand):
+    help = ('Создаёт синтетических пользователей, категории, места, '
+            'публикации и комментарии (Faker) пачками bulk_create для '
+            'нагрузочных замеров. Запускайте на отдельной базе, '
+            'не на рабочей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--random-seed', type=int,
+            help='Зерно генератора для воспроизводимых данных.',
+        )
+        parser.add_argument(
+            '--skip-rebuild', action='store_true',
+            help='Не пересчитывать счётчики комментариев и поисковый '
+                 'индекс.',
+        )
+
+    def handle(self, *args, **options):
+        created = generate(
+            users=options['users'],
+            categories=options['categories'],
+            locations=options['locations'],
+            posts=options['posts'],
+            comments=options['comments'],
+            batch_size=options['batch_size'],
+            seed=options['random_seed'],
+            log=self.stdout.write,
+        )
+        if options['posts'] and not options['skip_rebuild']:
+            if options['comments']:
+                call_command('rebuild_comment_counts', stdout=self.stdout)
+            call_command('rebuild_search_index', stdout=self.stdout)
+        invalidate_pages()
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано объектов: {created}.'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count пакетными UPDATE.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Сколько публикаций обновлять одним запросом.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        using = options['database']
+        posts = Post.objects.using(using)
+        comments = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        new_count = Coalesce(Subquery(comments), 0)
+        last_pk = posts.aggregate(last=Max('pk'))['last'] or 0
+        updated = 0
+        for start in range(0, last_pk, batch_size):
+            with transaction.atomic(using=using):
+                updated += posts.filter(
+                    pk__gt=start, pk__lte=start + batch_size
+                ).update(comment_count=new_count)
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики комментариев пересчитаны: {updated} публикаций.'
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.models import Post
+from blog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = ('Заново строит поисковый индекс публикаций. Запускайте после '
+            'миграции или смены BLOG_SEARCH_BACKEND.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько публикаций индексировать в одной транзакции.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        using = options['database']
+        backend = get_backend(using)
+        rows = Post.objects.using(using).order_by('pk').values_list(
+            'pk', 'title', 'text')
+        indexed = 0
+        with transaction.atomic(using=using):
+            backend.clear(using)
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic(using=using):
+                backend.index_many(batch, using)
+            indexed += len(batch)
+            last_pk = batch[-1][0]
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс построен: {indexed} публикаций '
+            f'({type(backend).__name__}).'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.publication import schedule_pending_publications
+
+
+class Command(BaseCommand):
+    help = ('Ставит в очередь jobs события для отложенных публикаций, '
+            'у которых их ещё нет. Запустите один раз при включении '
+            'BLOG_PUBLICATION_EVENTS и после очистки очереди; сами события '
+            'выполняет run_jobs.')
+
+    def handle(self, *args, **options):
+        created = schedule_pending_publications()
+        self.stdout.write(self.style.SUCCESS(
+            f'Запланировано событий публикации: {created}.'))
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:11
+
+from django.db import OperationalError, migrations, models, transaction
+import django.db.models.deletion
+
+
+def create_fts_table(apps, schema_editor):
+    # Без FTS5 (другая СУБД или сборка SQLite без расширения) поиск
+    # работает через таблицу PostTerm.
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE blog_post_search '
+                'USING fts5(title, text)'
+            )
+    except OperationalError:
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Терм')),
+                ('weight', models.PositiveIntegerField(verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'терм поиска',
+                'verbose_name_plural': 'Термы поиска',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postterm',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='post_term_unique'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
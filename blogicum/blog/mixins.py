@@ -9,21 +9,29 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
     login_url = '/auth/login'
 
 
-class OnlyPostAuthorMixin(UserPassesTestMixin):
-    def get_object(self):
-        post_pk = self.kwargs.get('post_pk')
-        post_object = get_object_or_404(Post.objects.select_related(
-            'location', 'category', 'author', ),
-            pk=post_pk
-        )
-        return post_object
+class CachedObjectMixin:
+    """Объект из get_queryset() по ключу pk_url_kwarg, один на запрос."""
+
+    pk_url_kwarg = 'pk'
+    _object = None
+
+    def get_object(self, queryset=None):
+        if self._object is None:
+            if queryset is None:
+                queryset = self.get_queryset()
+            self._object = get_object_or_404(
+                queryset, pk=self.kwargs[self.pk_url_kwarg])
+        return self._object
+
+
+class OnlyPostAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
+    pk_url_kwarg = 'post_pk'
+
+    def get_queryset(self):
+        return Post.objects.select_related('location', 'category', 'author')
 
     def test_func(self):
-        object = get_object_or_404(
-            Post.objects.select_related('author'),
-            pk=self.kwargs['post_pk']
-        )
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_pk=self.kwargs['post_pk'])
@@ -55,22 +63,29 @@ class PostFormMixin(PostMixin):
         return super().form_valid(form)
 
 
-class OnlyCommentAuthorMixin(UserPassesTestMixin):
-    def get_object(self):
-        comment = get_object_or_404(Comment, pk=self.kwargs['comment_pk'])
-        return comment
+class OnlyCommentAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
+    pk_url_kwarg = 'comment_pk'
+
+    def get_queryset(self):
+        return Comment.objects.select_related('post').filter(
+            post_id=self.kwargs['post_pk'])
+
+    def get_post_obj(self):
+        return self.get_object().post
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
 
 class CommentMixin:
     model = Comment
     template_name = 'blog/comment.html'
 
+    def get_post_obj(self):
+        return get_object_or_404(Post, pk=self.kwargs['post_pk'])
+
     def dispatch(self, request, *args, **kwargs):
-        self.post_obj = get_object_or_404(Post, pk=self.kwargs['post_pk'])
+        self.post_obj = self.get_post_obj()
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 
 User = get_user_model()
@@ -13,6 +15,9 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True,
                                       verbose_name='Добавлено',
                                       )
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name='Изменено',
+                                      )
 
     class Meta:
         abstract = True
@@ -27,6 +32,15 @@ class CustomManager(models.Manager):
             pub_date__lt=date_now
         )
 
+    def shift_comment_count(self, post_pk, delta):
+        return self.filter(pk=post_pk).update(
+            comment_count=Greatest(models.F('comment_count') + delta, 0),
+            updated_at=timezone.now(),
+        )
+
+    def touch(self, post_pk):
+        return self.filter(pk=post_pk).update(updated_at=timezone.now())
+
 
 class Post(BaseModel):
     objects = CustomManager()
@@ -57,15 +71,62 @@ class Post(BaseModel):
         help_text=('Если установить дату и время в будущем — '
                    'можно делать отложенные публикации.'),
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    @property
+    def card_version(self):
+        # Карточка показывает данные публикации, категории, места
+        # и автора: любая их правка должна менять ключ фрагмента.
+        # comment_count входит отдельно: rebuild_comment_counts меняет
+        # его, не трогая updated_at.
+        stamps = [
+            related.updated_at.timestamp() if related else 0
+            for related in (self, self.category, self.location)
+        ]
+        return '-'.join(map(str, stamps + [
+            self.comment_count, self.author.username]))
+
+    def save(self, *args, **kwargs):
+        # Счётчик меняется только через shift_comment_count и
+        # rebuild_comment_counts, поэтому обычное сохранение
+        # не должно затирать его устаревшим значением.
+        if (self.pk is not None and not self._state.adding
+                and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE,
@@ -78,6 +139,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
 
 
 class Category(BaseModel):
@@ -108,3 +175,25 @@ class Location(BaseModel):
 
     def __str__(self):
         return self.name
+
+
+class PostTerm(models.Model):
+    """Запись обратного индекса поиска: терм и его вес в публикации."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        verbose_name='Публикация',
+    )
+    term = models.CharField(max_length=64, verbose_name='Терм')
+    weight = models.PositiveIntegerField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'терм поиска'
+        verbose_name_plural = 'Термы поиска'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'), name='post_term_unique'
+            ),
+        )
@@ -0,0 +1,184 @@
+"""Кэш страниц для неавторизованных читателей и валидаторы 304.
+
+Страницы сбрасываются сменой поколения GENERATION_KEY в самом кэше,
+а не удалением ключей. Это работает, только если все процессы сайта
+делят один кэш: с LocMemCache каждый процесс меняет своё поколение,
+а остальные отдают устаревшие страницы до истечения
+PAGE_CACHE_TIMEOUT. Поэтому в prod settings требует общий кэш
+(DJANGO_CACHE=file или memcached).
+"""
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Post
+from .replica import note_write
+
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+PAGE_CACHE_PREFIX = 'blog:page'
+GENERATION_KEY = f'{PAGE_CACHE_PREFIX}:generation'
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate_pages():
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+    note_write()
+
+
+def next_publication(generation):
+    """Время ближайшей отложенной публикации или None.
+
+    Значение кэшируется в пределах поколения: любая правка публикаций
+    меняет поколение, а значит, и ключ.
+    """
+    key = f'{PAGE_CACHE_PREFIX}:{generation}:next_publication'
+    timestamp = cache.get(key)
+    if timestamp is None:
+        pub_date = Post.objects.filter(
+            is_published=True, pub_date__gt=timezone.now()
+        ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+        timeout = PAGE_CACHE_TIMEOUT
+        timestamp = 0
+        if pub_date is not None:
+            timestamp = pub_date.timestamp()
+            timeout = min(timeout, seconds_until(timestamp))
+        cache.set(key, timestamp, timeout)
+    return timestamp or None
+
+
+def seconds_until(timestamp):
+    return max(int(timestamp - timezone.now().timestamp()) + 1, 1)
+
+
+def page_timeout(generation):
+    timeout = PAGE_CACHE_TIMEOUT
+    if settings.BLOG_PUBLICATION_EVENTS:
+        # Кэш сбросит событие post_became_visible (blog.publication)
+        # из процесса run_jobs: settings требует для этого общий кэш.
+        return timeout
+    timestamp = next_publication(generation)
+    if timestamp is not None:
+        timeout = min(timeout, seconds_until(timestamp))
+    return timeout
+
+
+def page_cache_key(request, generation):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'{PAGE_CACHE_PREFIX}:{generation}:{path}'
+
+
+def cache_anonymous_page(view):
+    """Кэширует страницу целиком для неавторизованных читателей.
+
+    Кэш сбрасывается сигналами при изменении публикаций, комментариев,
+    категорий и мест, а срок хранения не превышает времени до ближайшей
+    отложенной публикации, если о ней не сообщит событие
+    (BLOG_PUBLICATION_EVENTS).
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return view(request, *args, **kwargs)
+        generation = get_generation()
+        key = page_cache_key(request, generation)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            cache.set(key, response, page_timeout(generation))
+        return response
+    return wrapper
+
+
+def page_validators(request, *parts, last_modified=True):
+    """Валидаторы (ETag, Last-Modified) по данным, из которых строится
+    страница.
+
+    ETag учитывает адрес и пользователя: авторизованным страница
+    показывается со ссылками на редактирование и CSRF-токеном, поэтому
+    в ETag входит и cookie CSRF — после смены токена при входе 304
+    вернул бы форму со старым токеном. Ленты передают
+    last_modified=False: удаление или снятие записи с публикации
+    не двигает максимум дат, и по одному If-Modified-Since клиент
+    получил бы 304 с удалённой записью.
+    """
+    user_parts = (request.user.get_username(),)
+    if request.user.is_authenticated:
+        user_parts += (request.META.get('CSRF_COOKIE', ''),)
+    source = '|'.join(str(part) for part in (
+        request.get_full_path(), *user_parts, *parts))
+    etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+    timestamps = [
+        part.timestamp() for part in parts if hasattr(part, 'timestamp')]
+    if not last_modified or not timestamps:
+        return etag, None
+    return etag, int(max(timestamps))
+
+
+def cached_validators(get_validators, request, *args, **kwargs):
+    """Для неавторизованных валидаторы хранятся рядом с кэшем страницы
+    и сбрасываются вместе с ним, чтобы повторный визит не стоил запроса.
+    """
+    if request.user.is_authenticated:
+        return get_validators(request, *args, **kwargs)
+    generation = get_generation()
+    key = f'{page_cache_key(request, generation)}:validators'
+    validators = cache.get(key)
+    if validators is None:
+        validators = get_validators(request, *args, **kwargs) or ()
+        cache.set(key, validators, page_timeout(generation))
+    return validators or None
+
+
+def conditional_page(get_validators):
+    """Отвечает 304 без рендера страницы, если валидаторы не изменились.
+
+    get_validators получает аргументы представления и возвращает
+    результат page_validators или None, если страница не проверяется
+    (например, её нет или она скрыта — тогда ответит само представление).
+    Last-Modified отдаётся только неавторизованным: без If-None-Match
+    по одной дате нельзя отличить версии страницы для разных
+    пользователей.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            validators = cached_validators(
+                get_validators, request, *args, **kwargs)
+            if validators is None:
+                return view(request, *args, **kwargs)
+            etag, last_modified = validators
+            if request.user.is_authenticated:
+                last_modified = None
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.setdefault('ETag', etag)
+                if last_modified is not None:
+                    response.setdefault(
+                        'Last-Modified', http_date(last_modified))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,68 @@
+"""События отложенной публикации.
+
+Для публикации с датой в будущем в очередь jobs ставится задача
+publish_post на момент pub_date. Обработчик run_jobs выполняет её
+в срок и отправляет сигнал post_became_visible, по которому
+сбрасываются кэш страниц и счётчики лент. Перенесённая или удалённая
+публикация делает старую задачу пустой: она сверяет дату из параметров
+с текущей.
+
+Сигнал отправляется в процессе run_jobs, и сброс доходит до веб-процессов
+только через общий кэш, поэтому settings не включает события с LocMemCache.
+"""
+from django.dispatch import Signal
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import enqueue, task
+
+from .models import Post
+
+
+# Аргумент instance — публикация, ставшая видимой.
+post_became_visible = Signal()
+
+
+def pub_date_key(pub_date):
+    return pub_date.astimezone(timezone.utc).isoformat()
+
+
+@task
+def publish_post(post_id, pub_date):
+    post = Post.objects.filter(pk=post_id).first()
+    if (post is None or not post.is_published
+            or pub_date_key(post.pub_date) != pub_date
+            or post.pub_date > timezone.now()):
+        return
+    post_became_visible.send(sender=Post, instance=post)
+
+
+def schedule_publication(post):
+    return enqueue(
+        publish_post,
+        run_at=post.pub_date,
+        post_id=post.pk,
+        pub_date=pub_date_key(post.pub_date),
+    )
+
+
+def schedule_pending_publications():
+    """Ставит задачи для будущих публикаций, у которых их ещё нет.
+
+    Нужна для публикаций, созданных до появления событий, и после
+    очистки очереди. Возвращает число новых задач.
+    """
+    scheduled = {
+        (job['post_id'], job['pub_date'])
+        for job in Job.objects.filter(
+            name=publish_post.task_name, status=Job.Status.QUEUED,
+        ).values_list('payload', flat=True)
+    }
+    created = 0
+    for post in Post.objects.filter(
+            is_published=True, pub_date__gt=timezone.now()).only(
+            'pk', 'pub_date').iterator():
+        if (post.pk, pub_date_key(post.pub_date)) not in scheduled:
+            schedule_publication(post)
+            created += 1
+    return created
@@ -0,0 +1,100 @@
+"""Чтение ленты и публикаций с реплики базы.
+
+Представления, отмеченные replica_reads, на GET и HEAD читают
+с псевдонима REPLICA, если он описан в DATABASES; всё остальное,
+включая любые записи, идёт в default. После изменяющего запроса
+пользователь получает cookie PIN_COOKIE и на REPLICA_STICKY_SECONDS
+остаётся на основной базе, чтобы видеть свои записи, пока реплика
+их догоняет.
+
+Остальные читатели на то же время уходят на основную базу после
+любого сброса кэшей (note_write): иначе первый запрос после записи
+заново наполнил бы кэш страниц, счётчиков и валидаторов данными
+с отстающей реплики, и они жили бы весь срок кэша.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA = 'replica'
+PIN_COOKIE = 'blogicum_primary'
+SAFE_METHODS = ('GET', 'HEAD')
+RECENT_WRITE_KEY = 'blog:replica:recent_write'
+# Сессии проверяются на каждом запросе: устаревшая копия на реплике
+# разлогинила бы только что вошедшего пользователя.
+PRIMARY_ONLY_APPS = frozenset({'sessions'})
+
+use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_reads(view):
+    """Отмечает представление (функцию или класс) как только читающее."""
+    view.replica_reads = True
+    return view
+
+
+def note_write():
+    """Отправляет все чтения на основную базу на время отставания реплики.
+
+    Вызывается при сбросе кэшей, то есть после записи.
+    """
+    if REPLICA in connections.databases:
+        cache.set(RECENT_WRITE_KEY, True, settings.REPLICA_STICKY_SECONDS)
+
+
+def replica_is_behind():
+    return cache.get(RECENT_WRITE_KEY) is not None
+
+
+def reads_from_replica(view_func):
+    view = getattr(view_func, 'view_class', view_func)
+    return getattr(view, 'replica_reads', False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (use_replica.get()
+                and model._meta.app_label not in PRIMARY_ONLY_APPS
+                and REPLICA in connections.databases):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = use_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method in SAFE_METHODS
+                and PIN_COOKIE not in request.COOKIES
+                and reads_from_replica(view_func)
+                and REPLICA in connections.databases
+                and not replica_is_behind()):
+            use_replica.set(True)
@@ -0,0 +1,164 @@
+import math
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, FloatField, Sum, When,
+)
+
+from .models import Post, PostTerm
+from .stemmer import terms
+
+
+FTS_TABLE = 'blog_post_search'
+TITLE_WEIGHT = 3
+SEARCH_RESULTS_LIMIT = 500
+TERM_MAX_LENGTH = PostTerm._meta.get_field('term').max_length
+
+
+class Fts5Backend:
+    """Индекс в виртуальной таблице SQLite FTS5.
+
+    В таблицу пишутся уже нормализованные термы, поэтому русская
+    морфология учитывается так же, как в TermsBackend, а ранжирует
+    встроенная bm25 с повышенным весом заголовка.
+    """
+
+    def index_many(self, rows, using=DEFAULT_DB_ALIAS):
+        rows = [
+            (pk, ' '.join(terms(title)), ' '.join(terms(text)))
+            for pk, title, text in rows
+        ]
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(pk,) for pk, _, _ in rows],
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, post_pk):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_pk])
+
+    def clear(self, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def search(self, query_terms, limit):
+        match = ' '.join(f'"{term}"' for term in query_terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}.0, 1.0) '
+                'LIMIT %s',
+                [match, limit],
+            )
+            return [pk for pk, in cursor.fetchall()]
+
+
+class TermsBackend:
+    """Обратный индекс в таблице PostTerm для баз без FTS5.
+
+    Вес терма в публикации — число вхождений, в заголовке
+    с множителем TITLE_WEIGHT; при поиске он умножается на idf.
+    """
+
+    def index_many(self, rows, using=DEFAULT_DB_ALIAS):
+        rows = list(rows)
+        post_terms = []
+        for pk, title, text in rows:
+            weights = Counter()
+            for term in terms(title):
+                weights[term[:TERM_MAX_LENGTH]] += TITLE_WEIGHT
+            for term in terms(text):
+                weights[term[:TERM_MAX_LENGTH]] += 1
+            post_terms.extend(
+                PostTerm(post_id=pk, term=term, weight=weight)
+                for term, weight in weights.items()
+            )
+        with transaction.atomic(using=using):
+            PostTerm.objects.using(using).filter(
+                post_id__in=[pk for pk, _, _ in rows]).delete()
+            PostTerm.objects.using(using).bulk_create(
+                post_terms, batch_size=500)
+
+    def remove(self, post_pk):
+        PostTerm.objects.filter(post_id=post_pk).delete()
+
+    def clear(self, using=DEFAULT_DB_ALIAS):
+        PostTerm.objects.using(using).delete()
+
+    def search(self, query_terms, limit):
+        query_terms = set(query_terms)
+        postings = PostTerm.objects.filter(term__in=query_terms)
+        frequencies = dict(
+            postings.order_by().values_list('term').annotate(Count('pk')))
+        if len(frequencies) < len(query_terms):
+            return []
+        total = Post.objects.count()
+        score = Sum(Case(
+            *(When(term=term, then=ExpressionWrapper(
+                F('weight') * math.log(1 + total / frequency),
+                output_field=FloatField()))
+              for term, frequency in frequencies.items()),
+            output_field=FloatField(),
+        ))
+        return list(
+            postings.order_by().values('post_id')
+            .annotate(score=score, matched=Count('pk'))
+            .filter(matched=len(query_terms))
+            .order_by('-score', '-post_id')
+            .values_list('post_id', flat=True)[:limit]
+        )
+
+
+BACKENDS = {
+    'fts5': Fts5Backend(),
+    'terms': TermsBackend(),
+}
+
+
+@lru_cache(maxsize=None)
+def fts5_table_exists(database_name, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    return (connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names())
+
+
+def get_backend(using=DEFAULT_DB_ALIAS):
+    name = getattr(settings, 'BLOG_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        database_name = connections[using].settings_dict['NAME']
+        name = ('fts5' if fts5_table_exists(database_name, using)
+                else 'terms')
+    return BACKENDS[name]
+
+
+def index_post(post):
+    get_backend().index_many([(post.pk, post.title, post.text)])
+
+
+def remove_post(post_pk):
+    get_backend().remove(post_pk)
+
+
+def search_posts(query, queryset, limit=SEARCH_RESULTS_LIMIT):
+    """Первичные ключи публикаций из queryset по убыванию релевантности.
+
+    Индекс ничего не знает о видимости, поэтому найденное
+    дополнительно фильтруется запросом (например, custom_filter).
+    """
+    query_terms = terms(query)
+    if not query_terms:
+        return []
+    ranked = get_backend().search(query_terms, limit)
+    visible = set(queryset.filter(pk__in=ranked).order_by().values_list(
+        'pk', flat=True))
+    return [pk for pk in ranked if pk in visible]
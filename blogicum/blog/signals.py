@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Category, Comment, Location, Post
+from .page_cache import invalidate_pages
+from .publication import post_became_visible, schedule_publication
+from .search import index_post, remove_post
+from .tasks import request_post_thumbnails
+from .thumbnails import has_thumbnails
+from .utils import feed_count_key, invalidate_feed_counts, post_feed_count_keys
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    instance._previous_feeds = instance._previous_schedule = None
+    if instance.pk is not None:
+        previous = Post.objects.filter(pk=instance.pk).values_list(
+            'category_id', 'author_id', 'pub_date', 'is_published').first()
+        if previous is not None:
+            instance._previous_feeds = previous[:2]
+            instance._previous_schedule = previous[2:]
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_became_visible)
+def reset_post_feed_counts(sender, instance, **kwargs):
+    keys = set(post_feed_count_keys(instance.category_id, instance.author_id))
+    previous_feeds = getattr(instance, '_previous_feeds', None)
+    if previous_feeds:
+        keys.update(post_feed_count_keys(*previous_feeds))
+    invalidate_feed_counts(*keys)
+
+
+@receiver(post_save, sender=Post)
+def queue_post_thumbnails(sender, instance, **kwargs):
+    if instance.image and not has_thumbnails(instance.image):
+        request_post_thumbnails(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_publication(sender, instance, **kwargs):
+    # Без событий задачи некому выполнять: они копились бы в очереди.
+    if not settings.BLOG_PUBLICATION_EVENTS:
+        return
+    schedule = (instance.pub_date, instance.is_published)
+    if (instance.is_published and instance.pub_date > timezone.now()
+            and getattr(instance, '_previous_schedule', None) != schedule):
+        schedule_publication(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_category_feed_counts(sender, instance, **kwargs):
+    author_ids = Post.objects.filter(category_id=instance.pk).values_list(
+        'author_id', flat=True).distinct()
+    invalidate_feed_counts(
+        feed_count_key('index'),
+        feed_count_key('category', instance.pk),
+        *(feed_count_key('author', author_id, 'published')
+          for author_id in author_ids),
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_became_visible)
+def reset_page_cache(sender, **kwargs):
+    invalidate_pages()
+
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search(sender, instance, **kwargs):
+    remove_post(instance.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
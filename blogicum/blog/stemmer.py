@@ -0,0 +1,126 @@
+"""Стеммер Snowball для русского языка и разбор текста на термы."""
+import re
+
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+ADJECTIVE = (
+    (),
+    ('ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+     'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+     'ая', 'яя', 'ою', 'ею'),
+)
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = (
+    (),
+    ('а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии',
+     'и', 'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам',
+     'ом', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия',
+     'ья', 'я'),
+)
+SUPERLATIVE = ((), ('ейш', 'ейше'))
+DERIVATIONAL = ((), ('ост', 'ость'))
+
+STOP_WORDS = frozenset((
+    'а', 'без', 'бы', 'в', 'во', 'вот', 'все', 'всё', 'вы', 'да', 'для',
+    'до', 'его', 'ее', 'её', 'если', 'же', 'за', 'и', 'из', 'или', 'им',
+    'их', 'к', 'как', 'ко', 'ли', 'мы', 'на', 'над', 'не', 'нет', 'ни',
+    'но', 'о', 'об', 'он', 'она', 'они', 'оно', 'от', 'по', 'под', 'при',
+    'с', 'со', 'так', 'то', 'ты', 'у', 'уже', 'что', 'это', 'я',
+))
+
+TOKEN_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile('[а-я]')
+
+
+def regions(word):
+    """Начала областей RV, R1 и R2 слова."""
+    rv = r1 = r2 = len(word)
+    for i, letter in enumerate(word):
+        if letter in VOWELS:
+            rv = i + 1
+            break
+    for i in range(1, len(word)):
+        if word[i - 1] in VOWELS and word[i] not in VOWELS:
+            r1 = i + 1
+            break
+    for i in range(r1 + 1, len(word)):
+        if word[i - 1] in VOWELS and word[i] not in VOWELS:
+            r2 = i + 1
+            break
+    return rv, r1, r2
+
+
+def remove_ending(word, start, groups):
+    """Отрезает самое длинное окончание из groups в области word[start:].
+
+    Окончания первой группы отрезаются, только если перед ними стоит
+    «а» или «я» из той же области. Возвращает (слово, найдено ли).
+    """
+    after_vowel, plain = groups
+    endings = sorted(
+        [(ending, True) for ending in after_vowel]
+        + [(ending, False) for ending in plain],
+        key=lambda item: len(item[0]), reverse=True,
+    )
+    for ending, needs_vowel in endings:
+        cut = len(word) - len(ending)
+        if cut < start or not word.endswith(ending):
+            continue
+        if needs_vowel and (cut - 1 < start or word[cut - 1] not in 'ая'):
+            return word, False
+        return word[:cut], True
+    return word, False
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    rv, _, r2 = regions(word)
+    word, found = remove_ending(word, rv, PERFECTIVE_GERUND)
+    if not found:
+        word, _ = remove_ending(word, rv, REFLEXIVE)
+        word, found = remove_ending(word, rv, ADJECTIVE)
+        if found:
+            word, _ = remove_ending(word, rv, PARTICIPLE)
+        else:
+            word, found = remove_ending(word, rv, VERB)
+            if not found:
+                word, _ = remove_ending(word, rv, NOUN)
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+    word, _ = remove_ending(word, max(r2, rv), DERIVATIONAL)
+    word, found = remove_ending(word, rv, SUPERLATIVE)
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif not found and word.endswith('ь') and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+def terms(text):
+    """Нормализованные термы текста.
+
+    Русские слова приводятся к основе, остальные — к нижнему регистру;
+    стоп-слова отбрасываются.
+    """
+    result = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOP_WORDS:
+            continue
+        result.append(stem(token) if CYRILLIC_RE.search(token) else token)
+    return result
@@ -0,0 +1,111 @@
+"""Синтетические данные для нагрузочных замеров.
+
+Тексты генерирует Faker (ru_RU), но один раз на запуск: из заранее
+созданных наборов строки выбираются случайно, иначе на миллионах
+публикаций Faker работал бы дольше самой вставки. Объекты вставляются
+пачками bulk_create без сигналов; счётчики комментариев и поисковый
+индекс пересчитываются командой generate_data после вставки.
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from faker import Faker
+
+from .models import Category, Comment, Location, Post
+
+
+User = get_user_model()
+
+POOL_SIZE = 1000
+BATCH_SIZE = 10000
+# Доля скрытых объектов и разброс дат (в минутах): небольшая часть
+# публикаций отложена в будущее.
+UNPUBLISHED_SHARE = 0.05
+UNPUBLISHED_CATEGORY_SHARE = 0.1
+PUB_DATE_MINUTES = (-10000, 5000000)
+
+
+class Pools:
+    """Наборы готовых строк Faker."""
+
+    def __init__(self, faker, size=POOL_SIZE):
+        self.titles = [faker.sentence(nb_words=5)[:256] for _ in range(size)]
+        self.texts = [faker.paragraph(nb_sentences=5) for _ in range(size)]
+        self.comments = [faker.sentence(nb_words=12) for _ in range(size)]
+        self.first_names = [faker.first_name() for _ in range(size)]
+        self.last_names = [faker.last_name() for _ in range(size)]
+        self.places = [faker.city() for _ in range(size)]
+        self.words = [faker.word() for _ in range(size)]
+
+
+def create_in_batches(model, count, build, batch_size, log, keep_ids=True):
+    """Создаёт count объектов build(i) и возвращает их первичные ключи."""
+    before = model.objects.order_by('-pk').values_list('pk', flat=True)
+    last_pk = before.first() or 0
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        model.objects.bulk_create(
+            (build(created + i) for i in range(size)),
+            batch_size=batch_size,
+        )
+        created += size
+        log(f'{model._meta.verbose_name_plural}: {created}/{count}')
+    if not keep_ids:
+        return []
+    return list(model.objects.filter(pk__gt=last_pk).order_by(
+        'pk').values_list('pk', flat=True))
+
+
+def generate(users=1000, categories=20, locations=100, posts=0,
+             comments=0, batch_size=BATCH_SIZE, seed=None, log=print):
+    """Заполняет базу синтетическими данными, возвращает число объектов.
+
+    Имена пользователей и слаги категорий получают метку запуска,
+    поэтому генератор можно запускать повторно на той же базе.
+    """
+    rng = random.Random(seed)
+    faker = Faker('ru_RU')
+    faker.seed_instance(seed)
+    pools = Pools(faker)
+    suffix = int(time.time())
+    password = make_password(None)
+    date_now = timezone.now()
+
+    user_ids = create_in_batches(User, users, lambda i: User(
+        username=f'synthetic_{suffix}_{i}',
+        first_name=rng.choice(pools.first_names),
+        last_name=rng.choice(pools.last_names),
+        password=password,
+    ), batch_size, log)
+    category_ids = create_in_batches(Category, categories, lambda i: Category(
+        title=f'{rng.choice(pools.words).capitalize()} {i}',
+        description=rng.choice(pools.texts),
+        slug=f'synthetic-{suffix}-{i}',
+        is_published=rng.random() > UNPUBLISHED_CATEGORY_SHARE,
+    ), batch_size, log)
+    location_ids = create_in_batches(Location, locations, lambda i: Location(
+        name=f'{rng.choice(pools.places)} {i}',
+    ), batch_size, log)
+    post_ids = create_in_batches(Post, posts, lambda i: Post(
+        author_id=rng.choice(user_ids),
+        category_id=rng.choice(category_ids),
+        location_id=rng.choice(location_ids),
+        title=rng.choice(pools.titles),
+        text=rng.choice(pools.texts),
+        is_published=rng.random() > UNPUBLISHED_SHARE,
+        pub_date=date_now - timedelta(
+            minutes=rng.randint(*PUB_DATE_MINUTES)),
+    ), batch_size, log) if posts else []
+    if post_ids and comments:
+        create_in_batches(Comment, comments, lambda i: Comment(
+            post_id=rng.choice(post_ids),
+            author_id=rng.choice(user_ids),
+            text=rng.choice(pools.comments),
+        ), batch_size, log, keep_ids=False)
+    return users + categories + locations + len(post_ids) + (
+        comments if post_ids else 0)
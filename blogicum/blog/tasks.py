@@ -0,0 +1,34 @@
+from django.core.cache import cache
+
+from jobs.queue import enqueue, task
+
+from .models import Post
+from .page_cache import invalidate_pages
+from .thumbnails import generate_thumbnails, has_thumbnails
+
+
+# Сколько секунд не ставить повторную задачу для того же изображения.
+THUMBNAILS_REQUEST_TIMEOUT = 60 * 60
+
+
+@task
+def create_post_thumbnails(post_id):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if (post is None or not post.image or has_thumbnails(post.image)
+            or not generate_thumbnails(post.image)):
+        return
+    # Карточка и страница до этого показывали исходный файл.
+    Post.objects.touch(post_id)
+    invalidate_pages()
+
+
+def request_post_thumbnails(post):
+    """Ставит создание копий в очередь, если его ещё не просили.
+
+    Отметка хранится в кэше, а не ищется в очереди: шаблон вызывает
+    функцию для каждой карточки без копий, и запрос к jobs_job
+    на каждую карточку выбил бы страницу из бюджета запросов.
+    """
+    key = f'blog:thumbnails:requested:{post.pk}:{post.image.name}'
+    if cache.add(key, True, THUMBNAILS_REQUEST_TIMEOUT):
+        enqueue(create_post_thumbnails, post_id=post.pk)
@@ -0,0 +1,18 @@
+from django import template
+
+from blog.tasks import request_post_thumbnails
+from blog.thumbnails import get_thumbnails
+
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, size):
+    thumbnails = get_thumbnails(post.image, size)
+    if thumbnails is None:
+        request_post_thumbnails(post)
+    return {
+        'post': post,
+        'thumbnails': thumbnails,
+    }
@@ -0,0 +1,92 @@
+import hashlib
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+
+THUMBNAIL_DIR = 'post_thumbnails'
+THUMBNAIL_SIZES = {
+    'card': (640, 480),
+    'detail': (960, 720),
+}
+THUMBNAIL_SCALES = (1, 2)
+THUMBNAIL_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+if not features.check('webp'):
+    THUMBNAIL_FORMATS = THUMBNAIL_FORMATS[1:]
+
+
+def thumbnail_name(image_name, size, scale, extension):
+    stem = posixpath.splitext(posixpath.basename(image_name))[0]
+    digest = hashlib.md5(image_name.encode()).hexdigest()[:8]
+    return posixpath.join(
+        THUMBNAIL_DIR, f'{stem}_{digest}', f'{size}_{scale}x.{extension}'
+    )
+
+
+def generate_thumbnails(image):
+    """Создаёт все уменьшенные копии изображения публикации.
+
+    Исходник открывается один раз; копии не увеличиваются сверх
+    размеров оригинала. Возвращает False, если файл не читается.
+    """
+    try:
+        with image.storage.open(image.name) as source:
+            original = ImageOps.exif_transpose(Image.open(source))
+            original.load()
+    except (OSError, UnidentifiedImageError):
+        return False
+    for size, (width, height) in THUMBNAIL_SIZES.items():
+        for scale in THUMBNAIL_SCALES:
+            resized = original.copy()
+            resized.thumbnail(
+                (width * scale, height * scale), Image.Resampling.LANCZOS
+            )
+            if resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+            for extension, image_format, options in THUMBNAIL_FORMATS:
+                buffer = BytesIO()
+                resized.save(buffer, image_format, **options)
+                name = thumbnail_name(image.name, size, scale, extension)
+                default_storage.delete(name)
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+    return True
+
+
+def fallback_thumbnail_name(image_name, size):
+    return thumbnail_name(
+        image_name, size, THUMBNAIL_SCALES[0], THUMBNAIL_FORMATS[-1][0]
+    )
+
+
+def has_thumbnails(image):
+    size = next(iter(THUMBNAIL_SIZES))
+    return default_storage.exists(fallback_thumbnail_name(image.name, size))
+
+
+def get_thumbnails(image, size):
+    """Адреса копий для srcset или None, пока копий нет.
+
+    Сами копии здесь не создаются: это делает задача
+    create_post_thumbnails вне запроса.
+    """
+    if not has_thumbnails(image):
+        return None
+    fallback_name = fallback_thumbnail_name(image.name, size)
+    sources = {}
+    for extension, image_format, _ in THUMBNAIL_FORMATS:
+        candidates = []
+        for scale in THUMBNAIL_SCALES:
+            name = thumbnail_name(image.name, size, scale, extension)
+            candidates.append(f'{default_storage.url(name)} {scale}x')
+        sources[image_format] = ', '.join(candidates)
+    return {
+        'src': default_storage.url(fallback_name),
+        'webp_srcset': sources.get('WEBP'),
+        'jpeg_srcset': sources['JPEG'],
+    }
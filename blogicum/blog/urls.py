@@ -7,6 +7,7 @@ app_name = 'blog'
 urlpatterns = [
     path('', views.index, name='index'),
     path('posts/<int:post_pk>/', views.post_detail, name='post_detail'),
+    path('search/', views.search, name='search'),
 
     path('category/<slug:category_slug>/',
          views.category_posts,
@@ -36,6 +37,10 @@ urlpatterns = [
          views.CommentCreateView.as_view(),
          name='add_comment'),
 
+    path('posts/<int:post_pk>/comments/',
+         views.post_comments,
+         name='post_comments'),
+
     path('posts/<int:post_pk>/edit_comment/<int:comment_pk>/',
          views.CommentUpdateView.as_view(),
          name='edit_comment'),
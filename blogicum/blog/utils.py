@@ -1,11 +1,288 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .replica import note_write
 
 
 PAGINATION_LIMIT = 10
+COMMENTS_PAGINATION_LIMIT = 20
+
+FEED_COUNT_TIMEOUT = 60
+# Счётчик без опроса: отложенные публикации сбрасывают его событием.
+FEED_COUNT_EVENTS_TIMEOUT = 60 * 15
+FEED_COUNT_KEY_PREFIX = 'blog:feed_count'
+
+PAGINATION_OFFSET = 'offset'
+PAGINATION_KEYSET = 'keyset'
+
+CURSOR_PARAM = 'cursor'
+CURSOR_FORWARD = 'f'
+CURSOR_BACKWARD = 'b'
+
+
+def encode_cursor(direction, date_value, pk):
+    raw = f'{direction}|{date_value.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Вернуть (direction, date, pk) или None для битого токена."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, date_raw, pk = raw.split('|')
+        date_value = parse_datetime(date_raw)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if date_value is None or direction not in (
+            CURSOR_FORWARD, CURSOR_BACKWARD):
+        return None
+    return direction, date_value, pk
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.number = None
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(
+            direction,
+            self.paginator.get_key_value(obj, self.paginator.date_field),
+            self.paginator.get_key_value(obj, self.paginator.pk_field),
+        )
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self._cursor(CURSOR_FORWARD, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self._cursor(CURSOR_BACKWARD, self.object_list[0])
+
+
+class KeysetPaginator:
+    """Постраничный вывод по ключу (date_field, pk_field) без OFFSET и COUNT.
+
+    Совместим с шаблоном includes/paginator.html: номера страниц
+    не вычисляются, вместо них передаются непрозрачные курсоры.
+    """
+
+    is_keyset = True
+    page_range = ()
+    num_pages = None
+    count = None
+
+    def __init__(self, object_list, per_page, date_field='pub_date',
+                 pk_field='id', descending=True):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.date_field = date_field
+        self.pk_field = pk_field
+        self.descending = descending
+
+    @staticmethod
+    def get_key_value(obj, field):
+        if isinstance(obj, dict):
+            return obj[field]
+        return getattr(obj, field)
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        return (f'{prefix}{self.date_field}', f'{prefix}{self.pk_field}')
+
+    def _after(self, date_value, pk, reverse=False):
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        return (
+            Q(**{f'{self.date_field}__{lookup}': date_value})
+            | Q(**{self.date_field: date_value,
+                   f'{self.pk_field}__{lookup}': pk})
+        )
+
+    def get_page(self, cursor=None):
+        decoded = decode_cursor(cursor) if cursor else None
+        limit = self.per_page + 1
+        if decoded is None:
+            rows = list(self.object_list.order_by(*self._ordering())[:limit])
+            return KeysetPage(
+                rows[:self.per_page], self, False, len(rows) > self.per_page
+            )
+        direction, date_value, pk = decoded
+        if direction == CURSOR_FORWARD:
+            rows = list(
+                self.object_list.filter(self._after(date_value, pk))
+                .order_by(*self._ordering())[:limit]
+            )
+            return KeysetPage(
+                rows[:self.per_page], self, True, len(rows) > self.per_page
+            )
+        rows = list(
+            self.object_list.filter(self._after(date_value, pk, reverse=True))
+            .order_by(*self._ordering(reverse=True))[:limit]
+        )
+        page_rows = rows[:self.per_page]
+        page_rows.reverse()
+        return KeysetPage(page_rows, self, len(rows) > self.per_page, True)
+
+
+def feed_count_key(*parts):
+    return ':'.join(str(part) for part in (FEED_COUNT_KEY_PREFIX, *parts))
+
+
+def post_feed_count_keys(category_id, author_id):
+    return (
+        feed_count_key('index'),
+        feed_count_key('category', category_id),
+        feed_count_key('author', author_id, 'published'),
+        feed_count_key('author', author_id, 'all'),
+    )
+
+
+def invalidate_feed_counts(*keys):
+    cache.delete_many(keys)
+    note_write()
+
+
+class ExactCount:
+    """Точный COUNT(*) по запросу без аннотаций и сортировки."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def __call__(self):
+        return self.queryset.order_by().count()
+
+
+class CachedCount(ExactCount):
+    """Счётчик ленты из кэша.
+
+    Пересчитывается раз в timeout секунд или после сброса ключа
+    сигналами при изменении публикаций и наступлении отложенных.
+    """
+
+    def __init__(self, key, queryset, timeout=None):
+        super().__init__(queryset)
+        self.key = key
+        if timeout is None:
+            timeout = (FEED_COUNT_EVENTS_TIMEOUT
+                       if settings.BLOG_PUBLICATION_EVENTS
+                       else FEED_COUNT_TIMEOUT)
+        self.timeout = timeout
+
+    def __call__(self):
+        count = cache.get(self.key)
+        if count is None:
+            count = super().__call__()
+            cache.set(self.key, count, self.timeout)
+        return count
+
+
+class EstimatedCount(ExactCount):
+    """Число строк всей таблицы по статистике базы.
+
+    PostgreSQL хранит оценку в pg_class, SQLite — в sqlite_stat1 после
+    ANALYZE. Если оценки нет, в запросе есть условия или таблица меньше
+    EXACT_BELOW строк, считается точный COUNT(*): на небольшой таблице
+    он дёшев, а устаревшая заниженная оценка обрезала бы постраничный
+    вывод.
+    """
+
+    EXACT_BELOW = 100000
+
+    def __call__(self):
+        if not self.queryset.query.where:
+            estimate = self.estimate()
+            if estimate is not None and estimate >= self.EXACT_BELOW:
+                return estimate
+        return super().__call__()
+
+    def estimate(self):
+        connection = connections[self.queryset.db]
+        table = self.queryset.model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class '
+                    'WHERE oid = to_regclass(%s)', [table])
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE name = 'sqlite_stat1'")
+                if cursor.fetchone() is None:
+                    return None
+                # Строка на каждый индекс, первое число — строк в нём.
+                # У частичных индексов (WHERE is_published) оно меньше,
+                # поэтому берётся наибольшее.
+                cursor.execute(
+                    'SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 '
+                    'WHERE tbl = %s', [table])
+            else:
+                return None
+            row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return None
+        estimate = int(str(row[0]).split()[0])
+        return estimate if estimate >= 0 else None
+
+
+class CountedPaginator(Paginator):
+    def __init__(self, object_list, per_page, counter=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self):
+        if self.counter is None:
+            return super().count
+        return self.counter()
+
+    def page(self, number):
+        # Страница выбирается до рендера шаблона, а не лениво в цикле.
+        page = super().page(number)
+        page.object_list = list(page.object_list)
+        return page
 
 
-def get_page_obj(obj_list, request):
-    paginator = Paginator(obj_list, PAGINATION_LIMIT)
+def get_page_obj(obj_list, request, mode=PAGINATION_OFFSET, counter=None):
+    if mode == PAGINATION_KEYSET:
+        paginator = KeysetPaginator(obj_list, PAGINATION_LIMIT)
+        return paginator.get_page(request.GET.get(CURSOR_PARAM))
+    paginator = CountedPaginator(obj_list, PAGINATION_LIMIT, counter=counter)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
@@ -1,10 +1,14 @@
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db import transaction
 from django.http import Http404, Http404
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, UpdateView, ListView, DeleteView
 from django.utils import timezone
+from django.utils.http import urlencode
 from .models import Post, Category, Comment
 from .forms import PostForm, CommentForm, UserForm
 from .mixins import (
@@ -16,11 +20,133 @@ from .mixins import (
     OnlyCommentAuthorMixin,
     CommentFormMixin
 )
-from .utils import get_page_obj
+from .page_cache import (
+    cache_anonymous_page,
+    conditional_page,
+    page_validators,
+)
+from .replica import replica_reads
+from .search import search_posts
+from .utils import (
+    PAGINATION_KEYSET,
+    PAGINATION_LIMIT,
+    PAGINATION_OFFSET,
+    COMMENTS_PAGINATION_LIMIT,
+    CURSOR_PARAM,
+    CachedCount,
+    CountedPaginator,
+    KeysetPaginator,
+    feed_count_key,
+    get_page_obj,
+)
 
 
 User = get_user_model()
 
+INDEX_PAGINATION = PAGINATION_OFFSET
+CATEGORY_PAGINATION = PAGINATION_OFFSET
+
+
+def index_counter(date_now):
+    return CachedCount(
+        feed_count_key('index'),
+        Post.objects.custom_filter(date_now),
+    )
+
+
+def category_counter(category_pk, date_now):
+    return CachedCount(
+        feed_count_key('category', category_pk),
+        Post.objects.custom_filter(date_now).filter(category_id=category_pk),
+    )
+
+
+def author_counter(author_pk, is_owner, date_now):
+    if is_owner:
+        return CachedCount(
+            feed_count_key('author', author_pk, 'all'),
+            Post.objects.filter(author_id=author_pk),
+        )
+    return CachedCount(
+        feed_count_key('author', author_pk, 'published'),
+        Post.objects.custom_filter(date_now).filter(author_id=author_pk),
+    )
+
+
+def feed_validators(request, queryset, counter, *parts):
+    """Валидаторы ленты одним агрегатным запросом.
+
+    Новые и изменённые записи (в том числе новые комментарии — они
+    обновляют updated_at записи) меняют максимумы дат, а удалённые и
+    снятые с публикации — число записей из кэша счётчиков. Поэтому
+    у лент только ETag, без Last-Modified.
+    """
+    state = queryset.order_by().aggregate(
+        last_pub_date=Max('pub_date'),
+        last_update=Max('updated_at'),
+        last_category_update=Max('category__updated_at'),
+        last_location_update=Max('location__updated_at'),
+    )
+    return page_validators(
+        request, *state.values(), counter(), *parts, last_modified=False)
+
+
+def index_validators(request):
+    date_now = timezone.now()
+    return feed_validators(
+        request, Post.objects.custom_filter(date_now), index_counter(date_now)
+    )
+
+
+def category_validators(request, category_slug):
+    category = Category.objects.filter(
+        slug=category_slug, is_published=True
+    ).values('pk', 'updated_at').first()
+    if category is None:
+        return None
+    date_now = timezone.now()
+    return feed_validators(
+        request,
+        Post.objects.custom_filter(date_now).filter(
+            category_id=category['pk']),
+        category_counter(category['pk'], date_now),
+        category['updated_at'],
+    )
+
+
+def profile_validators(request, username):
+    author = User.objects.filter(username=username).values(
+        'pk', 'first_name', 'last_name', 'date_joined', 'is_staff'
+    ).first()
+    if author is None:
+        return None
+    author_pk = author.pop('pk')
+    date_now = timezone.now()
+    is_owner = request.user.pk == author_pk
+    queryset = Post.objects.filter(author_id=author_pk)
+    if not is_owner:
+        queryset = Post.objects.custom_filter(date_now).filter(
+            author_id=author_pk)
+    return feed_validators(
+        request, queryset, author_counter(author_pk, is_owner, date_now),
+        *author.values()
+    )
+
+
+def post_validators(request, post_pk):
+    post = Post.objects.filter(pk=post_pk).values(
+        'pub_date', 'is_published', 'author_id', 'updated_at',
+        'category__updated_at', 'location__updated_at',
+    ).first()
+    if post is None or (
+            (post['pub_date'] > timezone.now() or not post['is_published'])
+            and request.user.pk != post['author_id']):
+        return None
+    return page_validators(
+        request, post['updated_at'], post['category__updated_at'],
+        post['location__updated_at'],
+    )
+
 
 class PostCreateView(CustomLoginRequiredMixin, PostFormMixin, CreateView):
     pass
@@ -40,10 +166,13 @@ class PostDeleteView(OnlyPostAuthorMixin, PostMixin, DeleteView):
         return context
 
 
+@replica_reads
+@method_decorator(conditional_page(profile_validators), name='dispatch')
 class ProfileListView(ProfileMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = 10
+    pagination_mode = PAGINATION_OFFSET
     user = None
 
     def get_queryset(self):
@@ -51,15 +180,26 @@ class ProfileListView(ProfileMixin, ListView):
         self.user = get_object_or_404(User, username=self.kwargs['username'])
         if self.request.user != self.user:
             queryset = Post.objects.custom_filter(date_now).filter(
-                author=self.user).annotate(
-                    comment_count=Count('comments')).order_by('-pub_date')
+                author=self.user).order_by('-pub_date')
         else:
             queryset = Post.objects.select_related(
                 'location', 'category', 'author').filter(
                 author=self.user
-            ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+            ).order_by('-pub_date')
         return queryset
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        counter = author_counter(
+            self.user.pk, self.request.user == self.user, timezone.now())
+        return CountedPaginator(queryset, per_page, counter=counter, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != PAGINATION_KEYSET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get(CURSOR_PARAM))
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.update({
@@ -81,66 +221,138 @@ class ProfileUpdateView(CustomLoginRequiredMixin, ProfileMixin, UpdateView):
 class CommentCreateView(CustomLoginRequiredMixin,
                         CommentFormMixin,
                         CreateView):
-    pass
+    def form_valid(self, form):
+        with transaction.atomic():
+            response = super().form_valid(form)
+            Post.objects.shift_comment_count(self.post_obj.pk, 1)
+        return response
 
 
 class CommentUpdateView(OnlyCommentAuthorMixin,
                         CommentFormMixin,
                         UpdateView):
-    pass
+    def form_valid(self, form):
+        with transaction.atomic():
+            response = super().form_valid(form)
+            Post.objects.touch(self.object.post_id)
+        return response
 
 
 class CommentDeleteView(OnlyCommentAuthorMixin,
                         CommentFormMixin,
                         DeleteView):
-
-    pass
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            Post.objects.shift_comment_count(self.object.post_id, -1)
+        return response
 
 
+@replica_reads
+@conditional_page(index_validators)
+@cache_anonymous_page
 def index(request):
     date_now = timezone.now()
     template_name = 'blog/index.html'
-    post_list = Post.objects.custom_filter(date_now).annotate(
-        comment_count=Count('comments')).order_by('-pub_date')
-    page_obj = get_page_obj(post_list, request)
+    post_list = Post.objects.custom_filter(date_now).order_by('-pub_date')
+    page_obj = get_page_obj(
+        post_list, request, mode=INDEX_PAGINATION,
+        counter=index_counter(date_now)
+    )
     context = {
         'page_obj': page_obj,
-        'comment_count': post_list.values('comment_count'),
     }
     return render(request, template_name, context)
 
 
+def get_visible_post(request, post_pk, queryset=Post.objects):
+    post = get_object_or_404(queryset, pk=post_pk)
+    if (post.pub_date > timezone.now() or not post.is_published) and (
+            request.user != post.author):
+        raise Http404
+    return post
+
+
+def get_comment_page(request, post):
+    paginator = KeysetPaginator(
+        Comment.objects.select_related('author').filter(post=post),
+        COMMENTS_PAGINATION_LIMIT,
+        date_field='created_at',
+        descending=False,
+    )
+    return paginator.get_page(request.GET.get(CURSOR_PARAM))
+
+
+@replica_reads
+@conditional_page(post_validators)
+@cache_anonymous_page
 def post_detail(request, post_pk):
-    date_now = timezone.now()
     template_name = 'blog/detail.html'
     form = CommentForm()
+    post = get_visible_post(
+        request, post_pk,
+        Post.objects.select_related('author', 'category', 'location')
+    )
+    comment_page = get_comment_page(request, post)
+    context = {
+        'post': post,
+        'form': form,
+        'comments': comment_page.object_list,
+        'comment_page': comment_page,
+    }
+    return render(request, template_name, context)
 
-    post = get_object_or_404(Post.objects.select_related('author'),
-                             pk=post_pk)
 
-    if (post.pub_date > date_now or not post.is_published) and (
-            request.user != post.author):
-        raise Http404
+@replica_reads
+@conditional_page(post_validators)
+@cache_anonymous_page
+def post_comments(request, post_pk):
+    template_name = 'includes/comment_list.html'
+    post = get_visible_post(request, post_pk)
+    comment_page = get_comment_page(request, post)
     context = {
         'post': post,
-        'form': form,
-        'comments': Comment.objects.select_related('author').filter(
-            post=post).order_by('created_at')
+        'comments': comment_page.object_list,
+        'comment_page': comment_page,
     }
     return render(request, template_name, context)
 
 
+@replica_reads
+@conditional_page(category_validators)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     date_now = timezone.now()
     template_name = 'blog/category.html'
     category = get_object_or_404(Category, slug=category_slug)
     if not category.is_published:
         raise Http404
-    post_list = category.posts.custom_filter(date_now).annotate(
-        comment_count=Count('comments')).order_by('-pub_date')
-    page_obj = get_page_obj(post_list, request)
+    post_list = category.posts.custom_filter(date_now).order_by('-pub_date')
+    page_obj = get_page_obj(
+        post_list, request, mode=CATEGORY_PAGINATION,
+        counter=category_counter(category.pk, date_now)
+    )
     context = {
         'category': category,
         'page_obj': page_obj,
     }
     return render(request, template_name, context)
+
+
+@cache_anonymous_page
+def search(request):
+    template_name = 'blog/search.html'
+    query = request.GET.get('q', '').strip()
+    posts = Post.objects.custom_filter(timezone.now())
+    post_pks = search_posts(query, posts) if query else []
+    page_obj = Paginator(post_pks, PAGINATION_LIMIT).get_page(
+        request.GET.get('page'))
+    found = posts.in_bulk(page_obj.object_list)
+    page_obj.object_list = [
+        found[pk] for pk in page_obj.object_list if pk in found]
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, template_name, context)
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def uses_cached_loader(engine):
+    return any(
+        isinstance(loader, CachedLoader) for loader in engine.template_loaders
+    )
+
+
+def warm_templates(using='django'):
+    """Компилирует все шаблоны из TEMPLATES['DIRS'] в кэш загрузчика.
+
+    Без кэширующего загрузчика (профиль dev) ничего не делает.
+    Ошибка синтаксиса в шаблоне всплывает сразу, при запуске процесса.
+    Возвращает число скомпилированных шаблонов.
+    """
+    engine = engines[using].engine
+    if not uses_cached_loader(engine):
+        return 0
+    warmed = 0
+    for directory in map(Path, engine.dirs):
+        for path in sorted(directory.rglob('*.html')):
+            engine.get_template(path.relative_to(directory).as_posix())
+            warmed += 1
+    return warmed
@@ -10,22 +10,46 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Профиль настроек задаётся переменной окружения BLOGICUM_ENV:
+# dev (по умолчанию) — DEBUG и debug_toolbar;
+# test — без отладочных приложений, с кэшем шаблонов и быстрым
+# хешированием паролей;
+# prod — без отладки, с кэшем шаблонов, постоянными соединениями
+# с базой и сжатием ответов; секретный ключ и хосты берутся
+# из окружения.
+BLOGICUM_ENV = os.environ.get('BLOGICUM_ENV', 'dev')
+if BLOGICUM_ENV not in ('dev', 'test', 'prod'):
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль BLOGICUM_ENV={BLOGICUM_ENV!r}: '
+        'ожидается dev, test или prod.'
+    )
+IS_PROD = BLOGICUM_ENV == 'prod'
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-c9=bv-xng1ukfdnrj3rx*co=(o=_(-4!lv)_c&h9g5#8@&uhzq'
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-c9=bv-xng1ukfdnrj3rx*co=(o=_(-4!lv)_c&h9g5#8@&uhzq',
+)
+if IS_PROD and 'DJANGO_SECRET_KEY' not in os.environ:
+    raise ImproperlyConfigured(
+        'В профиле prod задайте DJANGO_SECRET_KEY.')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = BLOGICUM_ENV == 'dev'
 
-ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 
 # Application definition
 
@@ -38,7 +62,8 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
-    'debug_toolbar',
+    'jobs.apps.JobsConfig',
+    'api.apps.ApiConfig',
     'django_bootstrap5',
 ]
 
@@ -50,9 +75,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'blog.replica.ReplicaMiddleware',
 ]
 
+if BLOGICUM_ENV == 'dev':
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+if IS_PROD:
+    MIDDLEWARE.insert(0, 'django.middleware.gzip.GZipMiddleware')
+
 ROOT_URLCONF = 'blogicum.urls'
 
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -65,7 +97,7 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
+        'APP_DIRS': BLOGICUM_ENV == 'dev',
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -77,37 +109,143 @@ TEMPLATES = [
     },
 ]
 
+# Вне dev шаблоны компилируются один раз на процесс; при
+# TEMPLATE_WARMUP это происходит при запуске, до первого запроса.
+if BLOGICUM_ENV != 'dev':
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+TEMPLATE_WARMUP = os.environ.get(
+    'DJANGO_TEMPLATE_WARMUP', '1' if IS_PROD else '0') == '1'
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# База выбирается переменной DJANGO_DB: sqlite (по умолчанию) или
+# postgresql с параметрами подключения из POSTGRES_*. Соединения
+# живут CONN_MAX_AGE секунд (в prod — минуту); за PgBouncer в режиме
+# transaction задайте POSTGRES_PGBOUNCER=1, чтобы .iterator() не
+# использовал серверные курсоры.
+DJANGO_DB = os.environ.get('DJANGO_DB', 'sqlite')
+
+CONN_MAX_AGE = int(
+    os.environ.get('DJANGO_CONN_MAX_AGE', 60 if IS_PROD else 0))
+
+if DJANGO_DB == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+        }
+    }
+    # Применяются к каждому новому соединению (blog.signals): в WAL
+    # читатели ленты не ждут писателей комментариев, а писатели ждут
+    # друг друга до busy_timeout мс вместо ошибки database is locked.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'mmap_size': 128 * 1024 * 1024,
+        'cache_size': -32 * 1024,
+        'busy_timeout': 5000,
     }
+elif DJANGO_DB == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'blogicum'),
+            'USER': os.environ.get('POSTGRES_USER', 'blogicum'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'DISABLE_SERVER_SIDE_CURSORS':
+                os.environ.get('POSTGRES_PGBOUNCER') == '1',
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестная база DJANGO_DB={DJANGO_DB!r}: '
+        'ожидается sqlite или postgresql.'
+    )
+
+# Реплика для чтения ленты и публикаций (blog.replica): в DJANGO_DB_REPLICA
+# для sqlite — путь к копии базы, для postgresql — хост реплики
+# с теми же POSTGRES_*. В тестах реплика зеркалирует default.
+DJANGO_DB_REPLICA = os.environ.get('DJANGO_DB_REPLICA')
+if DJANGO_DB_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DJANGO_DB == 'sqlite':
+        DATABASES['replica']['NAME'] = DJANGO_DB_REPLICA
+    else:
+        DATABASES['replica']['HOST'] = DJANGO_DB_REPLICA
+
+DATABASE_ROUTERS = ['blog.replica.ReplicaRouter']
+
+# Сколько секунд после изменяющего запроса пользователь читает
+# с основной базы.
+REPLICA_STICKY_SECONDS = int(
+    os.environ.get('DJANGO_REPLICA_STICKY_SECONDS', 10))
+
+
+# Кэш страниц и счётчиков лент (blog.page_cache, blog.utils) сбрасывается
+# сменой ключей в самом кэше, поэтому все процессы сайта должны делить
+# один кэш. DJANGO_CACHE: locmem — память процесса, только для dev и test
+# с одним процессом; file — каталог DJANGO_CACHE_DIR, общий для процессов
+# одной машины (по умолчанию в prod); memcached — сервер
+# DJANGO_CACHE_LOCATION, общий для нескольких машин (нужен pymemcache).
+# Фрагменты карточек ключуются версией публикации и не сбрасываются,
+# поэтому живут в отдельном кэше fragments в памяти процесса.
+DJANGO_CACHE = os.environ.get('DJANGO_CACHE', 'file' if IS_PROD else 'locmem')
+CACHE_MAX_ENTRIES = 10000
+LOCMEM_CACHE = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
 }
+if DJANGO_CACHE == 'locmem':
+    default_cache = LOCMEM_CACHE
+elif DJANGO_CACHE == 'file':
+    default_cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_DIR', str(BASE_DIR / 'cache')),
+        'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    }
+elif DJANGO_CACHE == 'memcached':
+    default_cache = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_LOCATION', '127.0.0.1:11211'),
+    }
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестный кэш DJANGO_CACHE={DJANGO_CACHE!r}: '
+        'ожидается locmem, file или memcached.'
+    )
+CACHES = {
+    'default': default_cache,
+    'fragments': {**LOCMEM_CACHE, 'LOCATION': 'fragments'},
+}
+SHARED_CACHE = DJANGO_CACHE != 'locmem'
+if IS_PROD and not SHARED_CACHE:
+    raise ImproperlyConfigured(
+        'В профиле prod нужен общий для процессов кэш: '
+        'задайте DJANGO_CACHE=file или memcached.'
+    )
 
-
-# Password validation
-# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
+if BLOGICUM_ENV == 'test':
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
 
 
 # Internationalization
@@ -149,3 +287,33 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Фоновые задачи (jobs): при JOBS_EAGER задачи выполняются сразу,
+# без очереди и обработчика run_jobs.
+JOBS_EAGER = False
+
+JOBS_MAX_ATTEMPTS = 5
+
+JOBS_RETRY_DELAY = 10
+
+JOBS_STALE_AFTER = 600
+
+# Отложенные публикации (blog.publication): задача в очереди jobs
+# сообщает о наступлении pub_date, и кэши сбрасываются в срок. Включайте,
+# когда работает обработчик run_jobs: тогда кэш страниц и счётчиков
+# живёт дольше и не опрашивает базу о ближайшей публикации. Кэш
+# сбрасывается в процессе run_jobs, поэтому нужен общий кэш
+# (DJANGO_CACHE=file или memcached). Задачи ставятся только при
+# включённых событиях; после включения запустите schedule_publications,
+# чтобы запланировать уже отложенные публикации.
+BLOG_PUBLICATION_EVENTS = os.environ.get(
+    'DJANGO_PUBLICATION_EVENTS', '0') == '1'
+if BLOG_PUBLICATION_EVENTS and not SHARED_CACHE:
+    raise ImproperlyConfigured(
+        'DJANGO_PUBLICATION_EVENTS=1 требует общего для процессов кэша: '
+        'задайте DJANGO_CACHE=file или memcached.'
+    )
+
+# Поиск по публикациям: 'fts5' (SQLite FTS5), 'terms' (таблица PostTerm)
+# или 'auto' — FTS5, если таблица для него создана миграцией.
+BLOG_SEARCH_BACKEND = 'auto'
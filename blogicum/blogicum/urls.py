@@ -17,8 +17,10 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.views import PasswordResetView
 from django.views.generic.edit import CreateView
 from django.urls import path, include, reverse_lazy
+from blog.forms import QueuedPasswordResetForm
 from django.conf import settings
 
 
@@ -36,9 +38,16 @@ urlpatterns = [
     ),
         name='registration'
     ),
+    path('auth/password_reset/', PasswordResetView.as_view(
+        form_class=QueuedPasswordResetForm,
+    ),
+        name='password_reset'
+    ),
     path('auth/', include('django.contrib.auth.urls')),
+    path('jobs/', include('jobs.urls')),
+    path('api/', include('api.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
@@ -0,0 +1,32 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'started_at',
+        'finished_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    readonly_fields = (
+        'name',
+        'payload',
+        'attempts',
+        'max_attempts',
+        'created_at',
+        'started_at',
+        'finished_at',
+        'last_error',
+    )
+    list_display_links = (
+        'name',
+    )
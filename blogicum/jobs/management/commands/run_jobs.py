@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import claim_next_job, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = 'Обработчик очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--max-jobs', type=int, default=0,
+            help='Завершиться после указанного числа задач.',
+        )
+
+    def handle(self, *args, **options):
+        requeue_stale()
+        processed = 0
+        while not options['max_jobs'] or processed < options['max_jobs']:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            job = run_job(job)
+            processed += 1
+            self.stdout.write(f'{job.name} #{job.pk}: {job.status}')
+        self.stdout.write(f'Выполнено задач: {processed}')
@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(max_length=256, verbose_name='Задача')
+    payload = models.JSONField(default=dict, verbose_name='Параметры')
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        verbose_name='Состояние',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток')
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5, verbose_name='Максимум попыток')
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Выполнить после')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено')
+    started_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Начата')
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Завершена')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(fields=('status', 'run_at'), name='job_due_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
@@ -0,0 +1,105 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Параметры задачи передаются именованными аргументами и должны
+    сериализоваться в JSON.
+    """
+    def decorator(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts or get_setting(
+            'JOBS_MAX_ATTEMPTS', 5)
+        _registry[func.task_name] = func
+        return func
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def enqueue(func, run_at=None, **payload):
+    if get_setting('JOBS_EAGER', False):
+        func(**payload)
+        return None
+    return Job.objects.create(
+        name=func.task_name,
+        payload=payload,
+        max_attempts=func.max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def retry_delay(attempts):
+    base = get_setting('JOBS_RETRY_DELAY', 10)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+
+def requeue_stale(stale_after=None):
+    """Возвращает в очередь задачи, брошенные упавшим обработчиком."""
+    stale_after = stale_after or get_setting('JOBS_STALE_AFTER', 600)
+    return Job.objects.filter(
+        status=Job.Status.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    ).update(status=Job.Status.QUEUED)
+
+
+def claim_next_job():
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.Status.QUEUED, run_at__lte=now
+    ).order_by('run_at').values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        # Условный UPDATE — атомарный захват, безопасный
+        # при нескольких обработчиках и на SQLite.
+        claimed = Job.objects.filter(
+            pk=pk, status=Job.Status.QUEUED
+        ).update(
+            status=Job.Status.RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    func = _registry.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {job.name} не зарегистрирована.')
+        func(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+            logger.exception('Задача %s #%s завершилась ошибкой',
+                             job.name, job.pk)
+        else:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+    else:
+        job.status = Job.Status.DONE
+        job.finished_at = timezone.now()
+    job.save(update_fields=(
+        'status', 'run_at', 'finished_at', 'last_error'))
+    return job
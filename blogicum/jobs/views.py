@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Avg, Count, F, Min, Q
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import Job
+
+
+METRICS_WINDOW = timedelta(hours=1)
+
+
+def seconds(value):
+    return value.total_seconds() if value is not None else None
+
+
+@staff_member_required
+def metrics(request):
+    now = timezone.now()
+    depth = dict(
+        Job.objects.order_by().values_list('status').annotate(Count('pk'))
+    )
+    oldest_due = Job.objects.filter(
+        status=Job.Status.QUEUED, run_at__lte=now
+    ).aggregate(oldest=Min('run_at'))['oldest']
+    recent = Job.objects.filter(
+        finished_at__gte=now - METRICS_WINDOW
+    ).aggregate(
+        finished=Count('pk'),
+        failed=Count('pk', filter=Q(status=Job.Status.FAILED)),
+        wait=Avg(F('started_at') - F('run_at')),
+        run=Avg(F('finished_at') - F('started_at')),
+    )
+    return JsonResponse({
+        'depth': {status: depth.get(status, 0) for status in Job.Status},
+        'oldest_due_age': seconds(now - oldest_due) if oldest_due else 0,
+        'window_seconds': METRICS_WINDOW.total_seconds(),
+        'finished': recent['finished'],
+        'failed': recent['failed'],
+        'avg_wait': seconds(recent['wait']),
+        'avg_run': seconds(recent['run']),
+    })
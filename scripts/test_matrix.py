@@ -0,0 +1,141 @@
+"""Прогон тестов на SQLite и PostgreSQL.
+
+PostgreSQL берётся по порядку: уже запущенный сервер из POSTGRES_HOST
+и остальных POSTGRES_*; временный кластер из локальных initdb и pg_ctl;
+встроенные бинарники пакета pgserver (pip install pgserver). Если
+ничего из этого нет, прогон на PostgreSQL пропускается.
+
+Пример: python scripts/test_matrix.py -- -k pagination
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKENDS = ('sqlite', 'postgresql')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_cluster(bin_dir):
+    data_dir = tempfile.mkdtemp(prefix='blogicum-pg-')
+    port = str(free_port())
+    subprocess.run(
+        [str(bin_dir / 'initdb'), '-D', data_dir, '-U', 'postgres',
+         '--auth=trust', '--no-sync'],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    subprocess.run(
+        [str(bin_dir / 'pg_ctl'), '-D', data_dir, '-w', '-l',
+         os.path.join(data_dir, 'server.log'), '-o',
+         f'-k {data_dir} -p {port} -c listen_addresses= -c fsync=off',
+         'start'],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    try:
+        yield {'POSTGRES_HOST': data_dir, 'POSTGRES_PORT': port,
+               'POSTGRES_USER': 'postgres', 'POSTGRES_DB': 'postgres'}
+    finally:
+        subprocess.run(
+            [str(bin_dir / 'pg_ctl'), '-D', data_dir, '-m', 'fast', 'stop'],
+            stdout=subprocess.DEVNULL,
+        )
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+@contextmanager
+def pgserver_cluster():
+    import pgserver
+
+    data_dir = tempfile.mkdtemp(prefix='blogicum-pgserver-')
+    server = pgserver.get_server(data_dir, cleanup_mode='delete')
+    try:
+        yield {'POSTGRES_HOST': str(server.pgdata), 'POSTGRES_PORT': '5432',
+               'POSTGRES_USER': 'postgres', 'POSTGRES_DB': 'postgres'}
+    finally:
+        server.cleanup()
+
+
+@contextmanager
+def postgres_server():
+    """Параметры подключения POSTGRES_* или None, если сервера нет."""
+    if os.environ.get('POSTGRES_HOST'):
+        yield {}
+        return
+    pg_ctl = shutil.which('pg_ctl')
+    if pg_ctl and shutil.which('initdb'):
+        with local_cluster(Path(pg_ctl).parent) as env:
+            yield env
+        return
+    try:
+        import pgserver  # noqa: F401
+    except ImportError:
+        yield None
+        return
+    with pgserver_cluster() as env:
+        yield env
+
+
+def run_pytest(backend, extra_env, pytest_args):
+    env = dict(os.environ, DJANGO_DB=backend, **extra_env)
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', *pytest_args],
+        cwd=ROOT, env=env,
+    ).returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--backend', action='append', choices=BACKENDS,
+        help='Какие базы проверять; по умолчанию все.',
+    )
+    parser.add_argument(
+        '--require-postgres', action='store_true',
+        help='Считать ошибкой отсутствие PostgreSQL вместо пропуска.',
+    )
+    parser.add_argument('pytest_args', nargs='*')
+    args = parser.parse_args()
+
+    results = {}
+    for backend in args.backend or BACKENDS:
+        if backend == 'sqlite':
+            results[backend] = run_pytest(backend, {}, args.pytest_args)
+            continue
+        try:
+            import psycopg2  # noqa: F401
+        except ImportError:
+            results[backend] = 'нет psycopg2'
+            continue
+        with postgres_server() as env:
+            if env is None:
+                results[backend] = 'нет сервера'
+                continue
+            results[backend] = run_pytest(backend, env, args.pytest_args)
+
+    failed = False
+    for backend, result in results.items():
+        if isinstance(result, str):
+            failed = failed or args.require_postgres
+            status = f'пропущено ({result})'
+        else:
+            failed = failed or result != 0
+            status = 'ok' if result == 0 else f'код {result}'
+        print(f'{backend}: {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
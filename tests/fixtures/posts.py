@@ -21,6 +21,27 @@ from conftest import (
 )
 
 
+@pytest.fixture
+def make_published_post(mixer: Mixer, user: Model, published_category):
+    """Фабрика видимых публикаций: вчерашних, без местоположения."""
+    def make_published_post(**fields):
+        fields = {
+            'author': user,
+            'is_published': True,
+            'category': published_category,
+            'location': None,
+            'pub_date': timezone.now() - timedelta(days=1),
+            **fields,
+        }
+        return mixer.blend('blog.Post', **fields)
+    return make_published_post
+
+
+@pytest.fixture
+def published_post(make_published_post):
+    return make_published_post()
+
+
 @pytest.fixture
 def posts_with_unpublished_category(mixer: Mixer, user: Model):
     return mixer.cycle(N_PER_FIXTURE).blend(
@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+from unittest import mock
+
+from django.db import connection
+from django.template.base import Template
+from django.test.utils import CaptureQueriesContext
+
+# Допустимое число SQL-запросов на один запрос к представлению
+# авторизованного пользователя, включая чтение сессии и пользователя.
+QUERY_BUDGETS = {
+    "blog:index": 5,
+    "blog:category_posts": 7,
+    "blog:post_detail": 5,
+    "blog:search": 7,
+    "blog:profile": 7,
+    "blog:edit_profile": 2,
+    "blog:create_post": 4,
+    "blog:edit_post": 5,
+    "blog:delete_post": 3,
+    "blog:post_comments": 5,
+    "blog:add_comment": 7,
+    "blog:edit_comment": 3,
+    "blog:delete_comment": 3,
+    "api:index": 3,
+    "api:category_posts": 4,
+    "api:profile": 4,
+    "api:post_detail": 3,
+    "api:post_comments": 4,
+    "api:export_posts": 1,
+}
+
+
+def format_queries(captured_queries) -> str:
+    return "\n".join(
+        f"{number}. {query['sql']}"
+        for number, query in enumerate(captured_queries, start=1)
+    )
+
+
+@contextmanager
+def query_budget(view_name: str):
+    assert view_name in QUERY_BUDGETS, (
+        f"Для представления `{view_name}` не задан бюджет SQL-запросов"
+        " в `QUERY_BUDGETS`."
+    )
+    budget = QUERY_BUDGETS[view_name]
+    with CaptureQueriesContext(connection) as context:
+        yield context
+    executed = len(context.captured_queries)
+    assert executed <= budget, (
+        f"Представление `{view_name}` выполнило {executed} SQL-запросов"
+        f" при бюджете {budget}:\n"
+        f"{format_queries(context.captured_queries)}"
+    )
+
+
+TemplateQuery = NamedTuple(
+    "TemplateQuery", [("template", Optional[str]), ("sql", str)]
+)
+
+
+@contextmanager
+def record_template_queries():
+    """Записывает каждый SQL-запрос вместе с шаблоном, который
+    рендерился в момент запроса (None — запрос выполнен вне рендера)."""
+    records: List[TemplateQuery] = []
+    rendering: List[str] = []
+    original_render = Template.render
+
+    def render(template, context):
+        rendering.append(template.name)
+        try:
+            return original_render(template, context)
+        finally:
+            rendering.pop()
+
+    def record(execute, sql, params, many, context):
+        records.append(TemplateQuery(
+            rendering[-1] if rendering else None, sql))
+        return execute(sql, params, many, context)
+
+    with mock.patch.object(Template, "render", render):
+        with connection.execute_wrapper(record):
+            yield records
+
+
+def lazy_loads(records: List[TemplateQuery]) -> List[TemplateQuery]:
+    """Запросы, выполненные во время рендера шаблонов.
+
+    Загрузка сессии и текущего пользователя при первом обращении
+    к `user` в шаблоне не считается ленивой загрузкой данных страницы.
+    """
+    result = []
+    session_user_pending = False
+    for record in records:
+        if record.template is None:
+            continue
+        if 'FROM "django_session"' in record.sql:
+            session_user_pending = True
+            continue
+        if session_user_pending and 'FROM "auth_user"' in record.sql:
+            session_user_pending = False
+            continue
+        result.append(record)
+    return result
+
+
+def format_template_queries(records: List[TemplateQuery]) -> str:
+    return "\n".join(
+        f"{number}. [{record.template}] {record.sql}"
+        for number, record in enumerate(records, start=1)
+    )
@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.admin import EstimatedCountPaginator
+from blog.models import Post
+from blog.utils import EstimatedCount
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/post/"
+
+
+def _blend_posts(mixer: Mixer, count):
+    return mixer.cycle(count).blend(
+        "blog.Post",
+        author=mixer.SELECT,
+        location=mixer.blend("blog.Location"),
+        category=mixer.blend("blog.Category"),
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def _changelist_queries(admin_client):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(CHANGELIST_URL)
+    assert response.status_code == 200
+    return len(queries), response.content.decode()
+
+
+def test_post_changelist_queries_do_not_grow_with_rows(
+    admin_client, mixer: Mixer
+):
+    mixer.cycle(3).blend("auth.User")
+    _blend_posts(mixer, 2)
+    few, _ = _changelist_queries(admin_client)
+    _blend_posts(mixer, 10)
+    many, content = _changelist_queries(admin_client)
+    assert many == few, (
+        "Убедитесь, что число запросов списка публикаций в админке не"
+        " зависит от числа строк: list_select_related, общие варианты"
+        f" категорий и автодополнение для авторов ({few} против {many})."
+    )
+    assert "admin-autocomplete" in content, (
+        "Убедитесь, что автор и местоположение в списке публикаций"
+        " выбираются через автодополнение."
+    )
+
+
+@pytest.mark.parametrize(
+    "model, lookup",
+    [("blog.Category", "category"), ("blog.Location", "location")],
+)
+def test_change_page_lists_only_recent_posts(
+    admin_client, mixer: Mixer, model, lookup
+):
+    obj = mixer.blend(model)
+    posts = mixer.cycle(15).blend(
+        "blog.Post",
+        **{lookup: obj},
+        pub_date=mixer.sequence(
+            lambda n: timezone.now() - timedelta(days=n)
+        ),
+    )
+    url = f"/admin/blog/{lookup}/{obj.pk}/change/"
+    content = admin_client.get(url).content.decode()
+    assert "form-TOTAL_FORMS" not in content, (
+        "Убедитесь, что публикации не встроены в страницу"
+        f" {model} редактируемыми формами."
+    )
+    assert posts[0].title in content and posts[-1].title not in content, (
+        "Убедитесь, что на странице показаны только последние публикации."
+    )
+    assert f"{CHANGELIST_URL}?{lookup}__id__exact={obj.pk}" in content, (
+        "Убедитесь, что страница ссылается на список публикаций,"
+        " отфильтрованный по объекту."
+    )
+    response = admin_client.get(
+        CHANGELIST_URL, {f"{lookup}__id__exact": obj.pk}
+    )
+    assert response.status_code == 200 and posts[-1].title in (
+        response.content.decode()
+    ), "Убедитесь, что список публикаций фильтруется по ссылке."
+
+
+def _post_updates(queries):
+    return [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+
+
+def test_bulk_publish_runs_single_update(admin_client, mixer: Mixer):
+    posts = mixer.cycle(12).blend("blog.Post", is_published=False)
+    already_published = mixer.blend("blog.Post", is_published=True)
+    selected = [post.pk for post in [*posts, already_published]]
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(CHANGELIST_URL, {
+            "action": "publish",
+            "_selected_action": selected,
+        }, follow=True)
+    assert len(_post_updates(queries)) == 1, (
+        "Убедитесь, что массовая публикация выполняется одним UPDATE."
+    )
+    assert all(
+        post.is_published for post in
+        type(already_published).objects.filter(
+            pk__in=[post.pk for post in posts]
+        )
+    ), "Убедитесь, что действие публикует выбранные публикации."
+    assert "12 из 13" in response.content.decode(), (
+        "Убедитесь, что после действия показан отчёт о числе изменённых"
+        " публикаций."
+    )
+
+
+def test_bulk_move_to_category(admin_client, mixer: Mixer):
+    posts = mixer.cycle(5).blend("blog.Post")
+    category = mixer.blend("blog.Category")
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.post(CHANGELIST_URL, {
+            "action": "move_to_category",
+            "category": category.pk,
+            "_selected_action": [post.pk for post in posts],
+        })
+    assert len(_post_updates(queries)) == 1, (
+        "Убедитесь, что перенос в категорию выполняется одним UPDATE."
+    )
+    assert category.posts.count() == len(posts), (
+        "Убедитесь, что действие переносит публикации в выбранную категорию."
+    )
+
+
+@pytest.fixture
+def stale_estimate(monkeypatch):
+    """Статистика базы насчитала всего одну публикацию."""
+    monkeypatch.setattr(EstimatedCount, "estimate", lambda self: 1)
+
+
+def test_small_table_counted_exactly(admin_client, mixer: Mixer,
+                                     stale_estimate):
+    _blend_posts(mixer, 3)
+    response = admin_client.get(CHANGELIST_URL)
+    assert response.context["cl"].result_count == 3, (
+        "Убедитесь, что для небольшой таблицы список публикаций в админке"
+        " считает строки точно, а не по устаревшей оценке."
+    )
+
+
+def test_paginator_reaches_rows_past_estimate(
+    mixer: Mixer, monkeypatch, user, stale_estimate
+):
+    monkeypatch.setattr(EstimatedCount, "EXACT_BELOW", 0)
+    posts = _blend_posts(mixer, 5)
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 2)
+    assert paginator.num_pages == 1
+    assert list(paginator.page(3).object_list) == posts[4:], (
+        "Убедитесь, что страницы за пределами оценки открываются,"
+        " пока в них есть строки."
+    )
+    with pytest.raises(EmptyPage):
+        paginator.page(4)
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Статистика sqlite_stat1"
+)
+def test_sqlite_estimate_ignores_partial_indexes(mixer: Mixer, user):
+    posts = _blend_posts(mixer, 4)
+    Post.objects.filter(pk=posts[0].pk).update(is_published=False)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        # Строка частичного индекса идёт первой.
+        cursor.execute("DELETE FROM sqlite_stat1 WHERE tbl = 'blog_post'")
+        cursor.executemany(
+            "INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, %s, %s)",
+            [
+                ("blog_post", "post_feed_idx", "3 3 1"),
+                ("blog_post", "post_author_feed_idx", "4 4 4 1"),
+            ],
+        )
+    assert EstimatedCount(Post.objects.all()).estimate() == 4, (
+        "Убедитесь, что оценка числа строк берётся по всей таблице,"
+        " а не по частичному индексу опубликованных записей."
+    )
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from django.db.models.signals import post_init
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(make_published_post, published_location):
+    return [
+        make_published_post(location=published_location)
+        for _ in range(N_PER_PAGE + 3)
+    ]
+
+
+@pytest.fixture
+def hidden_post(make_published_post):
+    return make_published_post(is_published=False)
+
+
+@pytest.fixture
+def instantiated_models():
+    created = []
+
+    def receiver(sender, **kwargs):
+        created.append(sender)
+
+    for model in (Post, Comment):
+        post_init.connect(receiver, sender=model, weak=False)
+    yield created
+    for model in (Post, Comment):
+        post_init.disconnect(receiver, sender=model)
+
+
+def _collect_pages(client, url):
+    ids = []
+    cursor = None
+    while True:
+        data = client.get(url, {"cursor": cursor} if cursor else {}).json()
+        ids += [item["id"] for item in data["results"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_api_feed_pages(client, api_posts, hidden_post):
+    ids = _collect_pages(client, "/api/posts/")
+    assert sorted(ids) == sorted(post.id for post in api_posts), (
+        "Убедитесь, что лента API постранично отдаёт все опубликованные"
+        " записи без повторов и не показывает скрытые."
+    )
+
+
+def test_api_feed_item(client, api_posts):
+    item = client.get("/api/posts/").json()["results"][0]
+    post = Post.objects.get(pk=item["id"])
+    assert item["author"] == post.author.username
+    assert item["category"]["slug"] == post.category.slug
+    assert item["location"] == post.location.name
+    assert item["comment_count"] == post.comment_count
+
+
+def test_api_does_not_instantiate_models(
+    client, api_posts, mixer: Mixer, another_user, instantiated_models
+):
+    post = api_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post, author=another_user)
+    instantiated_models.clear()
+    for url in ("/api/posts/", f"/api/posts/{post.id}/",
+                f"/api/posts/{post.id}/comments/",
+                f"/api/profile/{post.author.username}/"):
+        assert client.get(url).status_code == 200
+    assert not instantiated_models, (
+        "Убедитесь, что API читает данные через `.values()` и не создаёт"
+        " экземпляры моделей."
+    )
+
+
+def test_api_hidden_post(client, user_client, hidden_post):
+    assert client.get(f"/api/posts/{hidden_post.id}/").status_code == 404, (
+        "Убедитесь, что снятая с публикации запись недоступна через API."
+    )
+    assert user_client.get(f"/api/posts/{hidden_post.id}/").status_code == (
+        200
+    ), "Убедитесь, что автор видит свою скрытую запись через API."
+
+
+def test_api_etag(client, api_posts):
+    response = client.get("/api/posts/")
+    assert response.has_header("ETag"), (
+        "Убедитесь, что ответы API содержат заголовок ETag."
+    )
+    repeated = client.get("/api/posts/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeated.status_code == 304, (
+        "Убедитесь, что API отвечает 304 на запрос с актуальным"
+        " If-None-Match."
+    )
+
+
+def test_api_export_streams_all_posts(client, api_posts, hidden_post):
+    response = client.get("/api/posts/export/")
+    assert response.streaming, (
+        "Убедитесь, что выгрузка записей отдаётся StreamingHttpResponse."
+    )
+    items = json.loads(b"".join(response.streaming_content))
+    assert sorted(item["id"] for item in items) == sorted(
+        post.id for post in api_posts
+    )
@@ -0,0 +1,79 @@
+import io
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog.bulk_load import iter_json_array
+from blog.models import Category, Comment, Post
+from blog.synthetic import generate
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_iter_json_array_streams_in_small_chunks():
+    text = DB_JSON.read_text(encoding="utf-8")
+    streamed = list(iter_json_array(io.StringIO(text), chunk_size=7))
+    assert streamed == json.loads(text), (
+        "Убедитесь, что потоковый разбор фикстуры кусками возвращает те же"
+        " объекты, что и json.loads."
+    )
+
+
+def test_fast_loaddata_loads_repo_fixture():
+    fixture = {
+        item["pk"]: item["fields"]
+        for item in json.loads(DB_JSON.read_text(encoding="utf-8"))
+        if item["model"] == "blog.post"
+    }
+    call_command("fast_loaddata", str(DB_JSON), stdout=io.StringIO())
+    assert Post.objects.count() == len(fixture), (
+        "Убедитесь, что fast_loaddata загружает все публикации из db.json."
+    )
+    post = Post.objects.get(pk=min(fixture))
+    assert post.created_at.isoformat().startswith(
+        fixture[post.pk]["created_at"][:19]
+    ), "Убедитесь, что fast_loaddata сохраняет даты из фикстуры."
+    assert post.updated_at is not None, (
+        "Убедитесь, что отсутствующие в фикстуре updated_at заполняются."
+    )
+
+
+def test_generate_synthetic_data():
+    created = generate(
+        users=3, categories=2, locations=2, posts=10, comments=5,
+        seed=1, log=lambda message: None,
+    )
+    assert created == 22 and Post.objects.count() == 10, (
+        "Убедитесь, что генератор создаёт заданное число объектов."
+    )
+    assert Comment.objects.count() == 5 and Category.objects.count() == 2
+
+
+def test_fast_loaddata_rebuilds_target_database(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(
+        "blog.management.commands.fast_loaddata.load_fixture",
+        lambda file, batch_size, using: Counter({Post: 1}),
+    )
+    monkeypatch.setattr(
+        "blog.management.commands.fast_loaddata.call_command",
+        lambda name, **options: calls.append((name, options["database"])),
+    )
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text("[]", encoding="utf-8")
+    call_command(
+        "fast_loaddata", str(fixture), database="other",
+        stdout=io.StringIO(),
+    )
+    assert calls == [
+        ("rebuild_comment_counts", "other"),
+        ("rebuild_search_index", "other"),
+    ], (
+        "Убедитесь, что fast_loaddata пересчитывает счётчики и поисковый"
+        " индекс в той базе, куда загружена фикстура."
+    )
@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _comment_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_create_and_delete_shift_count(user_client, published_post):
+    post = published_post
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post.id}/comment/", data={"text": text})
+    assert _comment_count(post) == 2, (
+        "Убедитесь, что добавление комментария увеличивает"
+        " `comment_count` публикации."
+    )
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _comment_count(post) == 1, (
+        "Убедитесь, что удаление комментария уменьшает"
+        " `comment_count` публикации."
+    )
+
+
+def test_comment_edit_keeps_count(user_client, published_post):
+    post = published_post
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    comment = post.comments.get()
+    user_client.post(
+        f"/posts/{post.id}/edit_comment/{comment.id}/",
+        data={"text": "Исправленный текст"},
+    )
+    assert _comment_count(post) == 1
+
+
+def test_comment_count_never_negative(
+    mixer: Mixer, user_client, user, published_post
+):
+    post = published_post
+    # Комментарий создан в обход представления: счётчик остался нулём.
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert _comment_count(post) == 0
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert not post.comments.exists()
+    assert _comment_count(post) == 0, (
+        "Убедитесь, что `comment_count` не уходит ниже нуля."
+    )
+
+
+def test_rebuild_comment_counts_repairs_drift(
+    mixer: Mixer, user, published_post, make_published_post
+):
+    mixer.cycle(3).blend("blog.Comment", post=published_post, author=user)
+    empty = make_published_post()
+    Post.objects.filter(pk=empty.pk).update(comment_count=5)
+    call_command(
+        "rebuild_comment_counts", "--batch-size", "1", stdout=StringIO()
+    )
+    assert _comment_count(published_post) == 3
+    assert _comment_count(empty) == 0, (
+        "Убедитесь, что rebuild_comment_counts исправляет разошедшиеся"
+        " счётчики комментариев."
+    )
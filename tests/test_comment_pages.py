@@ -0,0 +1,87 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.utils import COMMENTS_PAGINATION_LIMIT
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = COMMENTS_PAGINATION_LIMIT * 2 + 5
+
+
+@pytest.fixture
+def discussed_post(mixer: Mixer, another_user, make_published_post):
+    post = make_published_post()
+    created_at = timezone.now() - timedelta(hours=1)
+    for i in range(N_COMMENTS):
+        mixer.blend(
+            "blog.Comment",
+            post=post,
+            author=another_user,
+            text=f"Комментарий номер {i:03d}",
+            created_at=created_at,
+        )
+    return post
+
+
+def _comment_numbers(content):
+    return [int(n) for n in re.findall(r"Комментарий номер (\d+)", content)]
+
+
+def _next_fragment_url(content):
+    match = re.search(r'data-comments-url="([^"]+)"', content)
+    return match and match.group(1)
+
+
+def test_detail_renders_first_comment_page(client, discussed_post):
+    content = client.get(f"/posts/{discussed_post.id}/").content.decode()
+    assert _comment_numbers(content) == list(
+        range(COMMENTS_PAGINATION_LIMIT)
+    ), (
+        "Убедитесь, что на странице публикации выводится только первая"
+        f" порция из {COMMENTS_PAGINATION_LIMIT} комментариев"
+        " в порядке добавления."
+    )
+    assert _next_fragment_url(content), (
+        "Убедитесь, что на странице публикации есть ссылка для загрузки"
+        " следующей порции комментариев."
+    )
+
+
+def test_comment_fragments_cover_all_comments(client, discussed_post):
+    content = client.get(f"/posts/{discussed_post.id}/").content.decode()
+    numbers = _comment_numbers(content)
+    url = _next_fragment_url(content)
+    while url:
+        response = client.get(url.replace("&amp;", "&"))
+        assert response.status_code == 200
+        fragment = response.content.decode()
+        assert "<html" not in fragment, (
+            "Убедитесь, что следующая порция комментариев отдаётся"
+            " HTML-фрагментом без шаблона страницы."
+        )
+        numbers += _comment_numbers(fragment)
+        url = _next_fragment_url(fragment)
+    assert numbers == list(range(N_COMMENTS)), (
+        "Убедитесь, что порции комментариев следуют друг за другом"
+        " без пропусков и повторов, даже при одинаковом времени создания."
+    )
+
+
+def test_comment_fragment_hidden_post(
+    another_user_client, mixer: Mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=False,
+        category=published_category,
+    )
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии к снятой с публикации записи"
+        " недоступны другим пользователям."
+    )
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+from django.conf import settings
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed(make_published_post, published_location):
+    return [
+        make_published_post(location=published_location) for _ in range(3)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("get_url", "dated"),
+    [
+        (lambda post: "/", False),
+        (lambda post: f"/category/{post.category.slug}/", False),
+        (lambda post: f"/posts/{post.id}/", True),
+        (lambda post: f"/profile/{post.author.username}/", False),
+    ],
+    ids=["index", "category", "post_detail", "profile"],
+)
+def test_unchanged_page_not_modified(client, feed, get_url, dated):
+    url = get_url(feed[0])
+    response = client.get(url)
+    assert response.has_header("ETag"), (
+        f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+    )
+    assert response.has_header("Last-Modified") == dated, (
+        "Убедитесь, что Last-Modified отдаёт только страница публикации,"
+        " а не ленты."
+    )
+    repeated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeated.status_code == 304, (
+        f"Убедитесь, что неизменившаяся страница `{url}` отвечает"
+        " 304 Not Modified."
+    )
+    assert repeated.context is None, (
+        "Убедитесь, что при ответе 304 шаблон страницы не рендерится."
+    )
+    if dated:
+        since = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert since.status_code == 304
+
+
+def test_comment_changes_post_validators(
+    client, another_user_client, feed
+):
+    post = feed[0]
+    url = f"/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    another_user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы публикации."
+    )
+    etag = client.get(url)["ETag"]
+    comment = post.comments.get()
+    another_user_client.post(
+        f"/posts/{post.id}/edit_comment/{comment.id}/",
+        data={"text": "Исправленный комментарий"},
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что правка комментария меняет ETag страницы публикации."
+    )
+
+
+def test_deleted_post_changes_feed_validators(client, feed):
+    etag = client.get("/")["ETag"]
+    oldest = min(feed, key=lambda post: post.pub_date)
+    oldest.delete()
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что удаление публикации меняет ETag ленты."
+    )
+
+
+def test_deleted_post_not_hidden_by_if_modified_since(client, feed):
+    client.get("/")
+    deleted = max(feed, key=lambda post: post.pub_date)
+    deleted.delete()
+    response = client.get(
+        "/", HTTP_IF_MODIFIED_SINCE=http_date(time.time())
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что после удаления публикации лента не отвечает 304"
+        " по одному заголовку If-Modified-Since."
+    )
+    assert deleted.title not in response.content.decode()
+
+
+def test_csrf_rotation_changes_validators(user_client, feed):
+    url = f"/posts/{feed[0].id}/"
+    user_client.get(url)
+    etag = user_client.get(url)["ETag"]
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    user_client.cookies[settings.CSRF_COOKIE_NAME] = "a" * 64
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после смены CSRF-токена авторизованный"
+        " пользователь получает страницу с новой формой, а не 304."
+    )
+
+
+def test_validators_depend_on_user(client, user_client, feed):
+    url = f"/posts/{feed[0].id}/"
+    etag = client.get(url)["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что авторизованный пользователь не получает 304"
+        " по ETag страницы, закэшированной для гостя."
+    )
+    assert not response.has_header("Last-Modified")
@@ -0,0 +1,74 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+CALLS = []
+
+
+@pytest.fixture
+def flaky_task():
+    from jobs.queue import task
+
+    @task(name="tests.flaky", max_attempts=2)
+    def flaky(value):
+        CALLS.append(value)
+        if len(CALLS) == 1:
+            raise RuntimeError("Первый запуск падает")
+
+    CALLS.clear()
+    return flaky
+
+
+def test_job_retried_with_backoff(flaky_task):
+    from jobs.models import Job
+    from jobs.queue import claim_next_job, enqueue, run_job
+
+    job = enqueue(flaky_task, value=1)
+    run_job(claim_next_job())
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED and job.last_error, (
+        "Убедитесь, что упавшая задача возвращается в очередь с ошибкой."
+    )
+    assert claim_next_job() is None, (
+        "Убедитесь, что повтор задачи откладывается на время задержки."
+    )
+    Job.objects.filter(pk=job.pk).update(run_at=job.created_at)
+    run_job(claim_next_job())
+    job.refresh_from_db()
+    assert job.status == Job.Status.DONE and job.attempts == 2
+    assert CALLS == [1, 1]
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"
+)
+def test_password_reset_email_sent_by_worker(client, user):
+    user.email = "reader@example.com"
+    user.save()
+    client.post("/auth/password_reset/", {"email": user.email})
+    assert not mail.outbox, (
+        "Убедитесь, что письмо для сброса пароля не отправляется"
+        " во время обработки запроса."
+    )
+    call_command("run_jobs", once=True, stdout=StringIO())
+    assert len(mail.outbox) == 1 and mail.outbox[0].to == [user.email]
+
+
+def test_metrics_require_staff(client, admin_client, flaky_task):
+    from jobs.queue import claim_next_job, enqueue, run_job
+
+    enqueue(flaky_task, value=1)
+    run_job(claim_next_job())
+    enqueue(flaky_task, value=2)
+    run_job(claim_next_job())
+    assert client.get("/jobs/metrics/").status_code == 302
+    metrics = admin_client.get("/jobs/metrics/").json()
+    assert metrics["depth"]["queued"] == 1, (
+        "Убедитесь, что метрики очереди показывают число ожидающих задач."
+    )
+    assert metrics["finished"] == 1 and metrics["avg_wait"] is not None
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+from query_budget import (
+    format_template_queries,
+    lazy_loads,
+    record_template_queries,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def rendered_post(mixer: Mixer, user, another_user, published_category,
+                  published_location):
+    posts = mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post",
+        author=mixer.sequence(user, another_user),
+        is_published=True,
+        category=published_category,
+        location=published_location,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Comment",
+        post=posts[0],
+        author=mixer.sequence(user, another_user),
+    )
+    return posts[0]
+
+
+@pytest.mark.parametrize(
+    ("client_name", "get_url"),
+    [
+        ("user_client", lambda post: "/"),
+        ("unlogged_client", lambda post: "/"),
+        ("user_client", lambda post: f"/category/{post.category.slug}/"),
+        ("user_client", lambda post: f"/posts/{post.id}/"),
+        ("unlogged_client", lambda post: f"/posts/{post.id}/"),
+        ("user_client", lambda post: f"/posts/{post.id}/comments/"),
+        ("user_client", lambda post: f"/profile/{post.author.username}/"),
+        ("another_user_client",
+         lambda post: f"/profile/{post.author.username}/"),
+    ],
+    ids=[
+        "index", "index-anonymous", "category", "post_detail",
+        "post_detail-anonymous", "post_comments", "profile-owner", "profile-other",
+    ],
+)
+def test_no_lazy_loads_while_rendering(
+    request, client_name, get_url, rendered_post
+):
+    client = request.getfixturevalue(client_name)
+    url = get_url(rendered_post)
+    with record_template_queries() as records:
+        response = client.get(url)
+    assert response.status_code == 200
+    lazy = lazy_loads(records)
+    assert not lazy, (
+        f"Убедитесь, что страница `{url}` загружает все данные до рендера"
+        " шаблона. Во время рендера выполнены запросы:\n"
+        f"{format_template_queries(lazy)}"
+    )
@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_index_served_from_cache(
+    client, published_post, django_assert_num_queries
+):
+    first = client.get("/")
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что повторный запрос главной страницы неавторизованным"
+        " пользователем отдаётся из кэша."
+    )
+
+
+def test_page_cache_reset_on_edit(client, published_post):
+    client.get(f"/posts/{published_post.id}/")
+    published_post.title = "Новый заголовок публикации"
+    published_post.save()
+    content = client.get(f"/posts/{published_post.id}/").content.decode()
+    assert published_post.title in content, (
+        "Убедитесь, что кэш страниц сбрасывается при изменении публикации."
+    )
+
+
+def test_scheduled_post_appears_without_purge(
+    client, make_published_post, published_post
+):
+    scheduled = make_published_post(
+        title="Отложенная публикация",
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert scheduled.title not in client.get("/").content.decode()
+    time.sleep(2)
+    assert scheduled.title in client.get("/").content.decode(), (
+        "Убедитесь, что отложенная публикация появляется в кэшированной"
+        " ленте, когда наступает время публикации."
+    )
+
+
+def test_authenticated_pages_not_cached(user_client, published_post):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None, (
+        "Убедитесь, что страницы авторизованных пользователей"
+        " не отдаются из общего кэша."
+    )
+
+
+def test_post_card_fragment_follows_comment_count(user_client, published_post):
+    user_client.get("/")
+    user_client.post(
+        f"/posts/{published_post.id}/comment/", data={"text": "Комментарий"}
+    )
+    content = user_client.get("/").content.decode()
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что закэшированная карточка публикации обновляется"
+        " после добавления комментария."
+    )
+
+
+def test_post_card_fragment_follows_rebuilt_comment_count(
+    user_client, mixer: Mixer, user, published_post
+):
+    user_client.get("/")
+    mixer.cycle(3).blend("blog.Comment", post=published_post, author=user)
+    call_command("rebuild_comment_counts", stdout=StringIO())
+    assert "Комментарии (3)" in user_client.get("/").content.decode(), (
+        "Убедитесь, что закэшированная карточка публикации обновляется"
+        " после пересчёта счётчиков комментариев."
+    )
+
+
+def test_post_card_fragment_follows_category_title(
+    user_client, published_post
+):
+    user_client.get("/")
+    category = published_post.category
+    category.title = "Переименованная категория"
+    category.save()
+    assert category.title in user_client.get("/").content.decode(), (
+        "Убедитесь, что закэшированная карточка публикации обновляется"
+        " при изменении категории."
+    )
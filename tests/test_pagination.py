@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    same_date = now - timedelta(days=1)
+    pub_dates = (
+        same_date if i % 3 == 0 else now - timedelta(hours=i + 30)
+        for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def test_keyset_paginator_walks_feed(feed_posts):
+    from blog.models import Post
+    from blog.utils import KeysetPaginator
+
+    queryset = Post.objects.custom_filter(timezone.now())
+    expected = list(
+        queryset.order_by("-pub_date", "-id").values_list("id", flat=True)
+    )
+    paginator = KeysetPaginator(queryset, N_PER_PAGE)
+    pages = [paginator.get_page(None)]
+    while pages[-1].has_next():
+        pages.append(paginator.get_page(pages[-1].next_cursor))
+
+    walked = [post.id for page in pages for post in page]
+    assert walked == expected, (
+        "Убедитесь, что курсорная пагинация выдаёт все публикации ленты"
+        " без пропусков и повторов, в том числе при совпадающих датах."
+    )
+    previous = paginator.get_page(pages[-1].previous_cursor)
+    assert [post.id for post in previous] == [post.id for post in pages[-2]], (
+        "Убедитесь, что курсор на предыдущую страницу возвращает"
+        " ту же страницу, что была показана перед текущей."
+    )
+
+
+def test_keyset_paginator_ignores_broken_cursor(feed_posts):
+    from blog.models import Post
+    from blog.utils import KeysetPaginator
+
+    paginator = KeysetPaginator(
+        Post.objects.custom_filter(timezone.now()), N_PER_PAGE
+    )
+    page = paginator.get_page("not-a-cursor")
+    assert not page.has_previous() and len(page) == N_PER_PAGE, (
+        "Убедитесь, что при некорректном курсоре выводится первая страница."
+    )
+
+
+def test_index_keyset_mode(client, feed_posts, monkeypatch):
+    from blog import views
+
+    monkeypatch.setattr(views, "INDEX_PAGINATION", views.PAGINATION_KEYSET)
+    response = client.get("/")
+    page_obj = response.context["page_obj"]
+    assert f"?cursor={page_obj.next_cursor}" in response.content.decode(), (
+        "Убедитесь, что в режиме курсорной пагинации шаблон пагинатора"
+        " выводит ссылку на следующую страницу с курсором."
+    )
+    last_page = client.get(f"/?cursor={page_obj.next_cursor}")
+    assert len(last_page.context["page_obj"]) == N_PER_PAGE
+
+
+def test_feed_count_is_cached_and_reset_on_publish(
+    user_client, feed_posts, django_assert_num_queries
+):
+    user_client.get("/")
+    # Валидаторы страницы, сессия, пользователь и выборка страницы,
+    # без COUNT.
+    with django_assert_num_queries(4):
+        response = user_client.get("/")
+    assert response.context["page_obj"].paginator.count == len(feed_posts), (
+        "Убедитесь, что число публикаций ленты берётся из кэша"
+        " и не пересчитывается на каждом запросе."
+    )
+    post = feed_posts[0]
+    post.is_published = False
+    post.save()
+    response = user_client.get("/")
+    assert response.context["page_obj"].paginator.count == (
+        len(feed_posts) - 1
+    ), (
+        "Убедитесь, что кэшированное число публикаций сбрасывается"
+        " при снятии публикации."
+    )
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.page_cache import get_generation
+from blog.publication import publish_post
+from jobs.models import Job
+from jobs.queue import claim_next_job, run_job
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _publication_jobs():
+    return Job.objects.filter(name=publish_post.task_name)
+
+
+@pytest.fixture(autouse=True)
+def publication_events(settings):
+    settings.BLOG_PUBLICATION_EVENTS = True
+
+
+@pytest.fixture
+def scheduled_post(make_published_post):
+    post = make_published_post(pub_date=timezone.now() + timedelta(hours=1))
+    Job.objects.exclude(name=publish_post.task_name).delete()
+    return post
+
+
+def test_future_post_schedules_publication_event(scheduled_post):
+    job = _publication_jobs().get()
+    assert job.run_at == scheduled_post.pub_date, (
+        "Убедитесь, что событие публикации запланировано на pub_date."
+    )
+    scheduled_post.title = "Новый заголовок"
+    scheduled_post.save()
+    assert _publication_jobs().count() == 1, (
+        "Убедитесь, что правка без смены даты не ставит событие заново."
+    )
+
+
+def test_publication_event_resets_caches(scheduled_post):
+    generation = get_generation()
+    with mock.patch(
+        "django.utils.timezone.now",
+        return_value=scheduled_post.pub_date + timedelta(seconds=1),
+    ):
+        run_job(claim_next_job())
+    assert get_generation() != generation, (
+        "Убедитесь, что наступление отложенной публикации сбрасывает"
+        " кэш страниц."
+    )
+
+
+def test_rescheduled_post_ignores_stale_event(scheduled_post):
+    scheduled_post.pub_date += timedelta(days=1)
+    scheduled_post.save()
+    generation = get_generation()
+    with mock.patch(
+        "django.utils.timezone.now",
+        return_value=scheduled_post.pub_date - timedelta(hours=1),
+    ):
+        run_job(claim_next_job())
+    assert get_generation() == generation, (
+        "Убедитесь, что событие с устаревшей датой публикации пропускается."
+    )
+
+
+def test_schedule_publications_backfills_missing_events(scheduled_post):
+    _publication_jobs().delete()
+    call_command("schedule_publications")
+    call_command("schedule_publications")
+    assert _publication_jobs().count() == 1, (
+        "Убедитесь, что команда schedule_publications ставит недостающие"
+        " события один раз."
+    )
+
+
+def test_no_events_queued_when_disabled(
+    settings, make_published_post, admin_client
+):
+    settings.BLOG_PUBLICATION_EVENTS = False
+    post = make_published_post(pub_date=timezone.now() + timedelta(hours=1))
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    admin_client.post(
+        "/admin/blog/post/",
+        {"action": "publish", "_selected_action": [post.pk]},
+    )
+    post.refresh_from_db()
+    assert post.is_published
+    assert not _publication_jobs().exists(), (
+        "Убедитесь, что без BLOG_PUBLICATION_EVENTS события публикации"
+        " не ставятся в очередь: их некому выполнять."
+    )
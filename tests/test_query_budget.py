@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+from query_budget import QUERY_BUDGETS, query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def budget_post(mixer: Mixer, user, published_location, published_category):
+    posts = mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        location=published_location,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    return posts[0]
+
+
+@pytest.fixture
+def budget_comment(mixer: Mixer, user, another_user, budget_post):
+    comments = mixer.cycle(N_PER_PAGE).blend(
+        "blog.Comment",
+        post=budget_post,
+        author=mixer.sequence(user, another_user),
+    )
+    return comments[0]
+
+
+def _budget_cases():
+    return (
+        ("blog:index", "get", lambda post, comment, user: {}),
+        ("blog:search", "get", lambda post, comment, user: {}),
+        ("blog:category_posts", "get",
+         lambda post, comment, user: {"category_slug": post.category.slug}),
+        ("blog:post_detail", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("blog:profile", "get",
+         lambda post, comment, user: {"username": user.username}),
+        ("blog:edit_profile", "get", lambda post, comment, user: {}),
+        ("blog:create_post", "get", lambda post, comment, user: {}),
+        ("blog:edit_post", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("blog:delete_post", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("blog:post_comments", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("blog:add_comment", "post",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("blog:edit_comment", "get",
+         lambda post, comment, user: {
+             "post_pk": post.pk, "comment_pk": comment.pk}),
+        ("blog:delete_comment", "get",
+         lambda post, comment, user: {
+             "post_pk": post.pk, "comment_pk": comment.pk}),
+        ("api:index", "get", lambda post, comment, user: {}),
+        ("api:category_posts", "get",
+         lambda post, comment, user: {"category_slug": post.category.slug}),
+        ("api:profile", "get",
+         lambda post, comment, user: {"username": user.username}),
+        ("api:post_detail", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("api:post_comments", "get",
+         lambda post, comment, user: {"post_pk": post.pk}),
+        ("api:export_posts", "get", lambda post, comment, user: {}),
+    )
+
+
+@pytest.mark.parametrize(
+    ("view_name", "method", "get_kwargs"),
+    _budget_cases(),
+    ids=[case[0] for case in _budget_cases()],
+)
+def test_view_query_budget(
+    view_name, method, get_kwargs, user, user_client,
+    budget_post, budget_comment,
+):
+    url = reverse(view_name, kwargs=get_kwargs(
+        budget_post, budget_comment, user))
+    data = {"text": "Комментарий"} if method == "post" else None
+    with query_budget(view_name):
+        response = getattr(user_client, method)(url, data)
+        if response.streaming:
+            b"".join(response.streaming_content)
+    assert response.status_code < 400, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+
+
+@pytest.mark.parametrize("namespace", ["blog", "api"])
+def test_every_blog_view_has_budget(namespace):
+    urls = get_resolver().namespace_dict[namespace][1].url_patterns
+    missing = [
+        f"{namespace}:{pattern.name}" for pattern in urls
+        if f"{namespace}:{pattern.name}" not in QUERY_BUDGETS
+    ]
+    assert not missing, (
+        "Задайте бюджет SQL-запросов в `QUERY_BUDGETS` для представлений: "
+        + ", ".join(missing)
+    )
@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, connections
+
+from blog.replica import PIN_COOKIE, RECENT_WRITE_KEY, REPLICA
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Реплику изображает второй файл SQLite",
+    ),
+]
+
+
+@pytest.fixture
+def replica(tmp_path, user, another_user, published_category):
+    """Снимок базы во втором файле SQLite: отстающая реплика."""
+    path = tmp_path / "replica.sqlite3"
+    target = sqlite3.connect(path)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
+            " AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%'"
+            " AND name NOT LIKE 'blog_post_search%'"
+        )
+        for table, sql in cursor.fetchall():
+            target.execute(sql)
+            rows = cursor.execute(f'SELECT * FROM "{table}"').fetchall()
+            if rows:
+                placeholders = ", ".join("?" * len(rows[0]))
+                target.executemany(
+                    f'INSERT INTO "{table}" VALUES ({placeholders})', rows
+                )
+    target.commit()
+    target.close()
+    connections.databases[REPLICA] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(path),
+    }
+    yield
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def lag_window_passed():
+    """Окно после записи истекло, а реплика так и не догнала базу."""
+    cache.delete(RECENT_WRITE_KEY)
+
+
+@pytest.fixture
+def lagging_post(replica, make_published_post):
+    post = make_published_post()
+    lag_window_passed()
+    return post
+
+
+def test_feed_reads_from_replica(client, lagging_post):
+    content = client.get("/").content.decode()
+    assert lagging_post.title not in content, (
+        "Убедитесь, что главная страница читает публикации с реплики."
+    )
+    response = client.get(f"/posts/{lagging_post.id}/")
+    assert response.status_code == 404, (
+        "Убедитесь, что страница публикации читает её с реплики."
+    )
+
+
+def test_author_reads_own_writes_from_primary(
+    user_client, another_user_client, lagging_post
+):
+    response = user_client.post(
+        f"/posts/{lagging_post.id}/comment/", data={"text": "Свой комментарий"}
+    )
+    assert PIN_COOKIE in response.cookies, (
+        "Убедитесь, что после изменяющего запроса пользователь закрепляется"
+        " за основной базой."
+    )
+    content = user_client.get(f"/posts/{lagging_post.id}/").content.decode()
+    assert "Свой комментарий" in content, (
+        "Убедитесь, что автор сразу видит свои записи, даже если реплика"
+        " отстаёт."
+    )
+    lag_window_passed()
+    response = another_user_client.get(f"/posts/{lagging_post.id}/")
+    assert response.status_code == 404, (
+        "Убедитесь, что остальные пользователи читают с реплики."
+    )
+
+
+def test_reset_cache_not_refilled_from_replica(client, lagging_post):
+    client.get("/")
+    lagging_post.title = "Исправленный заголовок"
+    lagging_post.save()
+    content = client.get("/").content.decode()
+    assert "Исправленный заголовок" in content, (
+        "Убедитесь, что сразу после сброса кэшей страницы читают"
+        " с основной базы, а не с отстающей реплики."
+    )
+    lag_window_passed()
+    content = client.get("/").content.decode()
+    assert "Исправленный заголовок" in content, (
+        "Убедитесь, что кэш страниц после записи наполняется данными"
+        " основной базы."
+    )
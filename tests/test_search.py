@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.search import fts5_table_exists
+from blog.stemmer import stem, terms
+from conftest import N_PER_PAGE
+from query_budget import query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["fts5", "terms"])
+def search_backend(request):
+    if request.param == "fts5" and not fts5_table_exists(
+        connection.settings_dict["NAME"]
+    ):
+        pytest.skip("В этой базе нет таблицы SQLite FTS5.")
+    with override_settings(BLOG_SEARCH_BACKEND=request.param):
+        yield request.param
+
+
+@pytest.fixture
+def make_post(make_published_post, search_backend):
+    def make_post(title, text, **kwargs):
+        return make_published_post(title=title, text=text, **kwargs)
+    return make_post
+
+
+def _found_titles(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return [post.title for post in response.context["page_obj"]]
+
+
+def test_stemmer_normalizes_russian_word_forms():
+    assert stem("книгой") == stem("книги") == stem("книга")
+    assert stem("красивая") == stem("красивые")
+    assert terms("Ёлка и Django") == ["елк", "django"]
+
+
+def test_search_matches_word_forms(client, make_post):
+    make_post("Путешествие на север", "Мы читали старые книги.")
+    make_post("Рецепт пирога", "Немного муки и сахара.")
+    assert _found_titles(client, "книгой") == ["Путешествие на север"], (
+        "Убедитесь, что поиск находит публикации по другим формам слова."
+    )
+    assert _found_titles(client, "путешествия книга") == [
+        "Путешествие на север"
+    ]
+    assert _found_titles(client, "путешествия пирог") == [], (
+        "Убедитесь, что поиск возвращает только публикации, содержащие"
+        " все слова запроса."
+    )
+
+
+def test_search_ranks_title_matches_first(client, make_post):
+    make_post("Заметки", "Между делом упомянем горы.")
+    make_post("Горы Кавказа", "Рассказ о поездке.")
+    assert _found_titles(client, "горы") == ["Горы Кавказа", "Заметки"], (
+        "Убедитесь, что совпадение в заголовке ранжируется выше,"
+        " чем в тексте."
+    )
+
+
+def test_search_respects_visibility(
+    client, make_post, mixer: Mixer, user
+):
+    unpublished_category = mixer.blend("blog.Category", is_published=False)
+    make_post("Видимая прогулка", "Текст.")
+    make_post("Скрытая прогулка", "Текст.", is_published=False)
+    make_post("Будущая прогулка", "Текст.",
+              pub_date=timezone.now() + timedelta(days=1))
+    make_post("Прогулка в скрытой категории", "Текст.",
+              category=unpublished_category)
+    assert _found_titles(client, "прогулка") == ["Видимая прогулка"], (
+        "Убедитесь, что поиск показывает только опубликованные записи"
+        " из опубликованных категорий."
+    )
+
+
+def test_search_index_follows_edits(client, make_post):
+    post = make_post("Осенний лес", "Листья.")
+    post.title = "Зимний лес"
+    post.save()
+    assert _found_titles(client, "осенний") == []
+    assert _found_titles(client, "зимние") == ["Зимний лес"], (
+        "Убедитесь, что поисковый индекс обновляется при сохранении"
+        " публикации."
+    )
+    post.delete()
+    assert _found_titles(client, "лес") == []
+
+
+def test_search_pagination_keeps_query(client, make_post):
+    for i in range(N_PER_PAGE + 2):
+        make_post(f"Море {i}", "Волны.")
+    make_post("Пустыня", "Песок.")
+    response = client.get("/search/", {"q": "море"})
+    assert "q=%D0%BC%D0%BE%D1%80%D0%B5&amp;page=2" in (
+        response.content.decode()
+    ), (
+        "Убедитесь, что ссылки пагинатора на странице поиска"
+        " сохраняют поисковый запрос."
+    )
+    assert len(_found_titles(client, "море", page=2)) == 2
+
+
+def test_search_query_budget(user_client, make_post):
+    for i in range(N_PER_PAGE):
+        make_post(f"Река {i}", "Течение.")
+    with query_budget("blog:search"):
+        response = user_client.get("/search/", {"q": "реки"})
+    assert len(response.context["page_obj"]) == N_PER_PAGE
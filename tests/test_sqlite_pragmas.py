@@ -0,0 +1,37 @@
+import pytest
+from django.conf import settings
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(settings, "SQLITE_PRAGMAS"),
+    reason="Прагмы настраиваются только для SQLite",
+)
+
+
+def _pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_new_sqlite_connection_gets_pragmas(tmp_path, django_db_blocker):
+    connection = DatabaseWrapper({
+        **settings.DATABASES["default"],
+        "NAME": str(tmp_path / "pragmas.sqlite3"),
+    })
+    with django_db_blocker.unblock():
+        try:
+            journal_mode = _pragma(connection, "journal_mode")
+            synchronous = _pragma(connection, "synchronous")
+            busy_timeout = _pragma(connection, "busy_timeout")
+        finally:
+            connection.close()
+    assert journal_mode == "wal", (
+        "Убедитесь, что соединения с SQLite открываются в режиме WAL."
+    )
+    assert synchronous == 1, (
+        "Убедитесь, что для SQLite задан synchronous = NORMAL."
+    )
+    assert busy_timeout == settings.SQLITE_PRAGMAS["busy_timeout"], (
+        "Убедитесь, что для SQLite задан busy_timeout из SQLITE_PRAGMAS."
+    )
@@ -0,0 +1,46 @@
+from copy import deepcopy
+from pathlib import Path
+
+from django.conf import settings
+from django.template import engines
+from django.test import override_settings
+
+from blog.warmup import warm_templates
+
+CACHED_LOADERS = [
+    ("django.template.loaders.cached.Loader", [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]),
+]
+
+
+def _cached_templates_settings():
+    templates = deepcopy(settings.TEMPLATES)
+    templates[0]["APP_DIRS"] = False
+    templates[0]["OPTIONS"]["loaders"] = CACHED_LOADERS
+    return templates
+
+
+def test_warmup_compiles_every_project_template():
+    with override_settings(TEMPLATES=_cached_templates_settings()):
+        warmed = warm_templates()
+        loader = engines["django"].engine.template_loaders[0]
+        cached = set(loader.get_template_cache)
+    expected = {
+        path.relative_to(settings.BASE_DIR / "templates").as_posix()
+        for path in Path(settings.BASE_DIR / "templates").rglob("*.html")
+    }
+    assert warmed == len(expected)
+    assert expected <= cached, (
+        "Убедитесь, что прогрев компилирует все шаблоны проекта"
+        " в кэширующий загрузчик."
+    )
+
+
+def test_warmup_skipped_without_cached_loader():
+    templates = deepcopy(settings.TEMPLATES)
+    templates[0]["APP_DIRS"] = True
+    templates[0]["OPTIONS"].pop("loaders", None)
+    with override_settings(TEMPLATES=templates, DEBUG=True):
+        assert warm_templates() == 0
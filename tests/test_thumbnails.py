@@ -0,0 +1,67 @@
+from io import StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from blog.page_cache import invalidate_pages
+from blog.tasks import create_post_thumbnails
+from jobs.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_image_served_as_thumbnails(
+    client, post_with_published_location
+):
+    from blog.thumbnails import THUMBNAIL_SCALES, thumbnail_name
+
+    call_command("run_jobs", once=True, stdout=StringIO())
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    img = BeautifulSoup(response.content, "html.parser").select_one("picture img")
+    image_name = post_with_published_location.image.name
+    expected = thumbnail_name(image_name, "detail", 1, "jpg")
+    assert img["src"] == default_storage.url(expected), (
+        "Убедитесь, что на странице публикации выводится уменьшенная"
+        " копия изображения, а не исходный файл."
+    )
+    assert all(f"{scale}x" in img["srcset"] for scale in THUMBNAIL_SCALES), (
+        "Убедитесь, что для изображения публикации задан `srcset`"
+        " с копиями для экранов высокой плотности."
+    )
+    assert default_storage.exists(expected)
+
+
+def test_post_page_leaves_thumbnails_to_worker(
+    client, post_with_published_location
+):
+    from blog.thumbnails import thumbnail_name
+
+    post = post_with_published_location
+    # Публикация как после fast_loaddata: ни задачи, ни отметки о ней.
+    Job.objects.all().delete()
+    cache.clear()
+    expected = thumbnail_name(post.image.name, "detail", 1, "jpg")
+    default_storage.delete(expected)
+    response = client.get(f"/posts/{post.id}/")
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert not default_storage.exists(expected), (
+        "Убедитесь, что страница публикации не создаёт уменьшенные копии"
+        " во время запроса."
+    )
+    assert soup.find("img", src=post.image.url), (
+        "Убедитесь, что пока копий нет, выводится исходное изображение."
+    )
+    assert Job.objects.filter(
+        name=create_post_thumbnails.task_name, payload__post_id=post.id
+    ).count() == 1, (
+        "Убедитесь, что при отсутствии копий их создание ставится"
+        " в очередь фоновых задач."
+    )
+    invalidate_pages()
+    client.get(f"/posts/{post.id}/")
+    assert Job.objects.count() == 1, (
+        "Убедитесь, что повторный показ не ставит задачу ещё раз."
+    )